@@ -4,7 +4,10 @@ import logging
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
 from datetime import datetime
+from collections import OrderedDict, deque
 import json
+import os
+import threading
 from pathlib import Path
 
 # Set up logging
@@ -15,6 +18,9 @@ logger = logging.getLogger(__name__)
 class BaseAgent(ABC):
     """Abstract base class for all agents in the LocAIted system."""
     
+    # Most recent errors kept per agent; older ones are dropped
+    MAX_ERRORS = 100
+    
     def __init__(self, name: str, use_cache: bool = True):
         """Initialize base agent.
         
@@ -26,16 +32,20 @@ class BaseAgent(ABC):
         self.use_cache = use_cache
         self.logger = logging.getLogger(f"locaited.{name}")
         
-        # Cost tracking
+        # Cost tracking; these are agent-lifetime totals, while each run's
+        # costs travel in the workflow state's <agent>_metrics
         self.last_cost = 0.0
         self.total_cost = 0.0
         
+        # Workflow runs share agents and may call them from several threads
+        self._metrics_lock = threading.Lock()
+        
         # Performance tracking
         self.last_execution_time = 0.0
         self.execution_count = 0
         
         # Error tracking
-        self.errors: List[str] = []
+        self.errors: deque = deque(maxlen=self.MAX_ERRORS)
         
         self.logger.info(f"{self.name} agent initialized")
     
@@ -77,15 +87,20 @@ class BaseAgent(ABC):
         """Log warning message."""
         self.logger.warning(f"[{self.name}] WARNING: {message}")
     
-    def track_cost(self, cost: float, operation: str = ""):
+    def track_cost(self, cost: float, operation: str = "", metrics: Optional[Dict[str, Any]] = None):
         """Track API costs.
         
         Args:
             cost: Cost in dollars
             operation: Optional description of the operation
+            metrics: The current run's metrics; its llm_cost accumulates the cost
         """
-        self.last_cost = cost
-        self.total_cost += cost
+        with self._metrics_lock:
+            self.last_cost = cost
+            self.total_cost += cost
+        
+        if metrics is not None:
+            metrics["llm_cost"] = metrics.get("llm_cost", 0) + cost
         
         if operation:
             self.log_info(f"Cost for {operation}: ${cost:.6f}")
@@ -121,7 +136,7 @@ class BaseAgent(ABC):
                 if self.execution_count > 0 else 0
             ),
             "error_count": len(self.errors),
-            "errors": self.errors[-5:] if self.errors else []  # Last 5 errors
+            "errors": list(self.errors)[-5:]  # Last 5 errors
         }
     
     def reset_metrics(self):
@@ -130,7 +145,7 @@ class BaseAgent(ABC):
         self.total_cost = 0.0
         self.last_execution_time = 0.0
         self.execution_count = 0
-        self.errors = []
+        self.errors.clear()
         
         self.log_info("Metrics reset")
     
@@ -193,6 +208,25 @@ class BaseAgent(ABC):
 class CachedAgent(BaseAgent):
     """Base agent with caching support."""
     
+    # Cache directories already created in this process. Agents are
+    # re-instantiated per workflow run, so skip the mkdir/index checks
+    # after the first instance.
+    _initialized_cache_dirs = set()
+    
+    # Entries kept in the in-process LRU in front of the disk cache
+    MEMORY_CACHE_SIZE = 128
+    
+    # Serializes index.json read-modify-writes across concurrent runs
+    _index_lock = threading.Lock()
+    
+    # cache_dir -> OrderedDict of cache_key -> (timestamp, serialized data),
+    # consulted before the JSON files. Shared by every instance on the same
+    # directory, so hits carry across runs and debug sessions. Entries hold
+    # the same JSON text written to disk, so a hit returns a fresh object
+    # with the types a disk hit would have.
+    _memory_caches: Dict[Path, OrderedDict] = {}
+    _memory_lock = threading.Lock()
+    
     def __init__(self, name: str, use_cache: bool = True, cache_ttl: int = 3600):
         """Initialize cached agent.
         
@@ -212,13 +246,21 @@ class CachedAgent(BaseAgent):
         from locaited.config import PROJECT_ROOT
         
         self.cache_dir = PROJECT_ROOT / "cache" / "v0.4.0" / self.name.lower()
+        self.cache_index_file = self.cache_dir / "index.json"
+        with CachedAgent._memory_lock:
+            self._memory_cache = CachedAgent._memory_caches.setdefault(self.cache_dir, OrderedDict())
+        
+        if self.cache_dir in CachedAgent._initialized_cache_dirs:
+            return
+        
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Create index file if it doesn't exist
-        self.cache_index_file = self.cache_dir / "index.json"
         if not self.cache_index_file.exists():
             with open(self.cache_index_file, 'w') as f:
                 json.dump({}, f)
+        
+        CachedAgent._initialized_cache_dirs.add(self.cache_dir)
     
     def get_cache_key(self, **kwargs) -> str:
         """Generate cache key from parameters.
@@ -250,13 +292,28 @@ class CachedAgent(BaseAgent):
         if not self.use_cache:
             return None
         
+        with CachedAgent._memory_lock:
+            entry = self._memory_cache.get(cache_key)
+            if entry is not None:
+                cached_time, data_json = entry
+                age = (datetime.now() - cached_time).total_seconds()
+                if age <= self.cache_ttl:
+                    self._memory_cache.move_to_end(cache_key)
+                else:
+                    del self._memory_cache[cache_key]
+                    entry = None
+        
+        if entry is not None:
+            self.log_info(f"Memory cache hit for key {cache_key[:8]}... (age: {age:.0f}s)")
+            return json.loads(data_json)
+        
         cache_file = self.cache_dir / f"{cache_key}.json"
         
         if not cache_file.exists():
             return None
         
         try:
-            with open(cache_file, 'r') as f:
+            with open(cache_file, 'r', encoding='utf-8') as f:
                 cache_data = json.load(f)
             
             # Check if expired
@@ -267,6 +324,11 @@ class CachedAgent(BaseAgent):
                 self.log_info(f"Cache expired for key {cache_key[:8]}...")
                 return None
             
+            self._remember(
+                cache_key,
+                cached_time,
+                json.dumps(cache_data['data'], separators=(",", ":"), ensure_ascii=False)
+            )
             self.log_info(f"Cache hit for key {cache_key[:8]}... (age: {age:.0f}s)")
             return cache_data['data']
             
@@ -287,13 +349,16 @@ class CachedAgent(BaseAgent):
         cache_file = self.cache_dir / f"{cache_key}.json"
         
         try:
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'data': data
-            }
+            now = datetime.now()
             
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2, default=str)
+            # Compact and unescaped: cache files are read back, not browsed
+            data_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+            self._remember(cache_key, now, data_json)
+            
+            self._write_atomic(
+                cache_file,
+                f'{{"timestamp":{json.dumps(now.isoformat())},"data":{data_json}}}'
+            )
             
             # Update index
             self._update_cache_index(cache_key, data)
@@ -303,6 +368,37 @@ class CachedAgent(BaseAgent):
         except Exception as e:
             self.log_error(f"Error saving to cache: {e}")
     
+    def _write_atomic(self, path: Path, text: str):
+        """Write a cache file so concurrent readers never see a partial file.
+        
+        Args:
+            path: Destination file
+            text: File contents
+        """
+        # Unique per process and thread; os.replace is atomic on POSIX and Windows
+        tmp_file = path.with_name(f"{path.name}.tmp{os.getpid()}-{threading.get_ident()}")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_file, path)
+        except Exception:
+            tmp_file.unlink(missing_ok=True)
+            raise
+    
+    def _remember(self, cache_key: str, cached_time: datetime, data_json: str):
+        """Store an entry in the in-process LRU, evicting the oldest if full.
+        
+        Args:
+            cache_key: Cache key
+            cached_time: When the data was cached
+            data_json: Cached data serialized as JSON
+        """
+        with CachedAgent._memory_lock:
+            self._memory_cache[cache_key] = (cached_time, data_json)
+            self._memory_cache.move_to_end(cache_key)
+            if len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+    
     def _update_cache_index(self, cache_key: str, data: Any):
         """Update cache index for quick lookups.
         
@@ -311,18 +407,22 @@ class CachedAgent(BaseAgent):
             data: Cached data (for metadata extraction)
         """
         try:
-            with open(self.cache_index_file, 'r') as f:
-                index = json.load(f)
-            
-            # Add metadata about this cache entry
-            index[cache_key] = {
+            entry = {
                 'timestamp': datetime.now().isoformat(),
                 'type': type(data).__name__,
                 'size': len(json.dumps(data, default=str))
             }
             
-            with open(self.cache_index_file, 'w') as f:
-                json.dump(index, f, indent=2)
+            # Concurrent runs update the same index; without the lock one
+            # run's read-modify-write would drop the other's entry
+            with CachedAgent._index_lock:
+                with open(self.cache_index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                
+                # Add metadata about this cache entry
+                index[cache_key] = entry
+                
+                self._write_atomic(self.cache_index_file, json.dumps(index, separators=(",", ":")))
                 
         except Exception as e:
             self.log_error(f"Error updating cache index: {e}")
@@ -335,6 +435,9 @@ class CachedAgent(BaseAgent):
         try:
             import shutil
             shutil.rmtree(self.cache_dir)
+            with CachedAgent._memory_lock:
+                self._memory_cache.clear()
+            CachedAgent._initialized_cache_dirs.discard(self.cache_dir)
             self._init_cache()
             self.log_info("Cache cleared")
         except Exception as e:
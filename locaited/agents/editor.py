@@ -3,6 +3,7 @@
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
+from collections import Counter
 
 from locaited.agents.base_agent import BaseAgent
 from locaited.utils.llm_client import get_llm_client
@@ -30,7 +31,9 @@ class EditorAgent(BaseAgent):
         try:
             # Build profile with LLM (handles both initial and retry)
             logger.info("Building profile with LLM...")
-            profile = self._build_profile_with_llm(state)
+            # Retry cycles add to the cost already recorded for this run
+            metrics = {"llm_cost": state.get("editor_metrics", {}).get("llm_cost", 0)}
+            profile = self._build_profile_with_llm(state, metrics)
             
             # Update state
             state["profile"] = profile
@@ -40,7 +43,7 @@ class EditorAgent(BaseAgent):
             # Track metrics
             state["editor_metrics"] = {
                 "iteration": profile["iteration"],
-                "llm_cost": self.total_cost
+                "llm_cost": metrics["llm_cost"]
             }
             
             # Determine if we should continue with retries
@@ -72,11 +75,16 @@ class EditorAgent(BaseAgent):
             state["editor_metrics"] = {"error": str(e)}
             return state
     
-    def _build_profile_with_llm(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_profile_with_llm(
+        self,
+        state: Dict[str, Any],
+        metrics: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Use LLM to build comprehensive profile and guidance.
         
         Args:
             state: Current state with user input and optional feedback
+            metrics: Run metrics whose llm_cost accumulates this call's cost
             
         Returns:
             Profile dict with guidance
@@ -126,7 +134,7 @@ Return JSON with:
         )
         
         # Update cost tracking
-        self.total_cost += response["cost"]
+        self.track_cost(response["cost"], "profile", metrics)
         
         profile = response["parsed_content"]
         
@@ -181,10 +189,9 @@ Return JSON with:
         
         # Add previous leads summary if available
         if state.get("leads"):
-            lead_types = {}
-            for lead in state["leads"][:10]:  # Sample first 10
-                lead_type = lead.get("type", "unknown")
-                lead_types[lead_type] = lead_types.get(lead_type, 0) + 1
+            lead_types = dict(Counter(
+                lead.get("type", "unknown") for lead in state["leads"][:10]  # Sample first 10
+            ))
             
             context_parts.append(f"\nPrevious attempt generated: {lead_types}")
         
@@ -1,11 +1,13 @@
 """Fact-Checker Agent - Tavily evidence gatherer."""
 
 import logging
-from typing import Dict, Any, List
+import hashlib
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 from locaited.agents.base_agent import CachedAgent
+from locaited.config import FACT_CHECKER_MAX_CONCURRENT_SEARCHES
 from locaited.utils.tavily_client import get_tavily_client
 
 logger = logging.getLogger(__name__)
@@ -50,9 +52,10 @@ class FactCheckerAgent(CachedAgent):
                 state["fact_checker_metrics"] = cached_result["metrics"]
                 return state
             
-            # Search for evidence
+            # Search for evidence; on a retry cycle the previous cycle's
+            # evidence is still in state and covers any repeated queries
             logger.info(f"Searching for evidence on {len(leads)} leads...")
-            evidence = self._batch_search_leads(leads)
+            evidence = self._batch_search_leads(leads, state.get("evidence") or [])
             
             # Track metrics
             metrics = {
@@ -65,7 +68,7 @@ class FactCheckerAgent(CachedAgent):
             }
             
             # Update cost tracking
-            self.total_cost += self.tavily_client.total_cost
+            self.track_cost(self.tavily_client.total_cost, "evidence searches")
             
             # Save to cache
             result = {"evidence": evidence, "metrics": metrics}
@@ -87,8 +90,7 @@ class FactCheckerAgent(CachedAgent):
             logger.error(f"Error gathering evidence: {e}")
             self.errors.append({
                 "timestamp": datetime.now().isoformat(),
-                "error": str(e),
-                "state": state
+                "error": str(e)
             })
             
             # Return empty evidence on error
@@ -96,44 +98,86 @@ class FactCheckerAgent(CachedAgent):
             state["fact_checker_metrics"] = {"error": str(e)}
             return state
     
-    def _batch_search_leads(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _batch_search_leads(
+        self,
+        leads: List[Dict[str, Any]],
+        previous_evidence: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
         """Search for evidence on multiple leads.
         
         Args:
             leads: List of event leads
+            previous_evidence: Evidence from an earlier cycle to reuse for
+                leads with the same search query
             
         Returns:
             List of evidence results
         """
-        evidence = []
-        
-        for i, lead in enumerate(leads):
-            logger.info(f"Searching evidence {i+1}/{len(leads)}: {lead['description'][:50]}...")
-            
-            try:
-                # Search using the prepared query
-                search_results = self._search_for_evidence(lead)
-                
-                evidence.append({
-                    "lead": lead,
-                    "results": search_results.get("results", []),
-                    "answer": search_results.get("answer"),
-                    "search_time": search_results.get("search_time", 0)
-                })
-                
-                # Small delay to avoid rate limiting
-                if i < len(leads) - 1:
-                    time.sleep(0.5)
-                    
-            except Exception as e:
-                logger.error(f"Failed to search for lead {i+1}: {e}")
-                evidence.append({
-                    "lead": lead,
-                    "results": [],
-                    "error": str(e)
-                })
-        
-        return evidence
+        if not leads:
+            return []
+        
+        total = len(leads)
+        
+        # Failed searches are retried rather than reused
+        known = {
+            self._lead_query(item["lead"]): item
+            for item in previous_evidence or []
+            if "error" not in item and isinstance(item.get("lead"), dict)
+        }
+        
+        # Searches are independent network calls, so run them concurrently
+        # and collect results in lead order. Leads that share a search query
+        # share one search.
+        queries = [self._lead_query(lead) for lead in leads]
+        
+        with ThreadPoolExecutor(max_workers=min(FACT_CHECKER_MAX_CONCURRENT_SEARCHES, total)) as executor:
+            futures = {}
+            for i, (lead, query) in enumerate(zip(leads, queries)):
+                if query not in known and query not in futures:
+                    futures[query] = executor.submit(self._search_lead, lead, i, total)
+            
+            if len(futures) < total:
+                logger.info(f"Sharing searches: {total} leads, {len(futures)} new queries")
+            
+            evidence = []
+            for lead, query in zip(leads, queries):
+                result = known[query] if query in known else futures[query].result()
+                if result["lead"] is not lead:
+                    result = {**result, "lead": lead}
+                evidence.append(result)
+            return evidence
+    
+    def _search_lead(self, lead: Dict[str, Any], index: int, total: int) -> Dict[str, Any]:
+        """Search for evidence on a single lead.
+        
+        Args:
+            lead: Event lead
+            index: Position of the lead in the batch
+            total: Number of leads in the batch
+            
+        Returns:
+            Evidence result for the lead
+        """
+        logger.info(f"Searching evidence {index+1}/{total}: {lead['description'][:50]}...")
+        
+        try:
+            # Search using the prepared query
+            search_results = self._search_for_evidence(lead)
+            
+            return {
+                "lead": lead,
+                "results": search_results.get("results", []),
+                "answer": search_results.get("answer"),
+                "search_time": search_results.get("search_time", 0)
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to search for lead {index+1}: {e}")
+            return {
+                "lead": lead,
+                "results": [],
+                "error": str(e)
+            }
     
     def _search_for_evidence(self, lead: Dict[str, Any]) -> Dict[str, Any]:
         """Search Tavily for evidence of a specific lead.
@@ -144,18 +188,26 @@ class FactCheckerAgent(CachedAgent):
         Returns:
             Search results from Tavily
         """
-        # Use the pre-built search query from Researcher
-        query = lead.get("search_query", lead["description"])
-        
         # Search with appropriate parameters for event evidence
         return self.tavily_client.search(
-            query=query,
+            query=self._lead_query(lead),
             search_depth="advanced",  # Use advanced for better event details
             max_results=10,  # Get multiple sources
             include_answer=True,  # Get AI summary
             include_raw_content=False  # Don't need raw HTML
         )
     
+    def _lead_query(self, lead: Dict[str, Any]) -> str:
+        """Get the search query for a lead.
+        
+        Args:
+            lead: Event lead
+            
+        Returns:
+            The Researcher's pre-built search query, or the description
+        """
+        return lead.get("search_query", lead["description"])
+    
     def _generate_cache_key(self, leads: List[Dict[str, Any]]) -> str:
         """Generate cache key from leads.
         
@@ -165,9 +217,9 @@ class FactCheckerAgent(CachedAgent):
         Returns:
             Cache key string
         """
-        # Create a stable key from lead descriptions
-        lead_strings = [lead.get("description", "") for lead in leads[:5]]  # First 5 for key
-        return "_".join(lead_strings)[:100]  # Limit length
+        # Key on every query that will be searched, so a hit covers the whole batch
+        queries = [lead.get("search_query", lead.get("description", "")) for lead in leads]
+        return hashlib.blake2b("\n".join(queries).encode(), digest_size=16).hexdigest()
     
     def validate_output(self, state: Dict[str, Any]) -> bool:
         """Validate fact-checker output.
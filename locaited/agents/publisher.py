@@ -1,14 +1,162 @@
 """Publisher Agent - Event extraction and gate decision."""
 
 import logging
+import hashlib
+import heapq
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from urllib.parse import urlsplit, parse_qsl, urlencode
 
 from locaited.agents.base_agent import CachedAgent
 from locaited.utils.llm_client import get_llm_client
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates are built once at import; per-call work is a single format().
+EXTRACTION_SYSTEM_PROMPT = """You are an expert at extracting specific event information from search results.
+
+Your job is to:
+1. Extract concrete events with specific dates (YYYY-MM-DD format)
+2. Deduplicate similar events (keep the most complete version)
+3. Focus on events that photographers can actually attend
+4. Return ONLY the top 15 most promising events
+
+For each event, extract ALL available information:
+- title: Descriptive title that captures what makes this event interesting
+- date: MANDATORY specific date (YYYY-MM-DD format)
+- time: Include if mentioned (e.g., "7:30 PM", "morning", "all day") or make reasonable inference (e.g., "evening" for concerts)
+- location: Specific venue or address (MANDATORY)
+- description: What makes this event visually interesting or newsworthy
+- organizer: Who is organizing (if mentioned)
+- url: Source URL where you found this information (MANDATORY)
+
+GUIDELINES:
+- MUST have specific date and location
+- Time is valuable but not required - include when available or inferable
+- Always include a meaningful description explaining the event's appeal
+- Always include the source URL for verification
+- Deduplicate: combine information from multiple sources about the same event
+- Skip events that already happened or have no specific date
+- LIMIT: Return maximum 15 events"""
+
+EXTRACTION_USER_PROMPT_TEMPLATE = """Extract unique events from these search results:
+
+{evidence_text}
+
+Return the 15 BEST events prioritizing:
+1. Events with specific dates and locations (required)
+2. High photographic/visual potential
+3. Strong news value or cultural significance
+4. Events matching user interests
+
+For each event:
+- Extract time if mentioned, otherwise provide reasonable estimate ("morning", "evening", "all day")
+- Write a brief description explaining WHY this event is interesting
+- Include the source URL where you found the most complete information
+
+Return JSON:
+{{
+    "events": [
+        {{
+            "title": "Descriptive event title",
+            "date": "YYYY-MM-DD",  // REQUIRED
+            "time": "Time if known OR reasonable estimate",
+            "location": "Specific venue/address",  // REQUIRED
+            "description": "What makes this visually interesting",
+            "organizer": "Organization name if mentioned",
+            "access_req": "Public/Press/Ticketed if mentioned",
+            "url": "https://source-url.com"  // REQUIRED
+        }}
+    ]
+}}
+
+Maximum 15 events. Focus on quality over quantity."""
+
+GATE_SYSTEM_PROMPT_TEMPLATE = """You are a photo editor making decisions about event coverage.
+
+User interests: {interests}
+
+Your job is to evaluate if we have at least 5 HIGH-QUALITY events worth covering.
+
+High-quality events must have:
+1. Specific date (exact YYYY-MM-DD)
+2. Specific location (venue or address)
+3. Clear photographic potential
+4. Relevance to user interests
+
+Time information is valuable but not required - many legitimate events don't announce specific times until closer to the date.
+
+Make a gate decision:
+- APPROVE: If you have 5+ high-quality events
+- RETRY: If quality or quantity is insufficient"""
+
+GATE_USER_PROMPT_TEMPLATE = """Evaluate these {event_count} events:
+
+{events_text}
+
+If APPROVE: Return the top 10 events from those provided, scored 0-100 based on:
+- Photographic potential (visual interest, action, emotion)
+- Newsworthiness (timeliness, relevance, impact)
+- Specificity (clear time, location, access info)
+
+If RETRY: Explain what's missing and suggest what to search for.
+
+Return JSON:
+{{
+    "decision": "APPROVE or RETRY",
+    "events": [  // if APPROVE
+        {{
+            "title": "Event title",
+            "score": 85,
+            ...all original fields...
+        }}
+    ],
+    "feedback": "Explanation if RETRY"
+}}"""
+
+# Query parameters that never change page content
+TRACKING_PARAMS = frozenset({
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "fbclid", "gclid", "ref"
+})
+
+
+def _canonical_url(url: str) -> str:
+    """Normalize a URL so scheme, www. and tracking-parameter variants compare equal.
+    
+    Args:
+        url: Source URL
+        
+    Returns:
+        Canonical form without scheme, fragment or tracking parameters
+    """
+    parts = urlsplit(url.strip())
+    netloc = parts.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    
+    query = ""
+    if parts.query:
+        query = urlencode([
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS
+        ])
+    
+    canonical = netloc + parts.path.rstrip("/")
+    return f"{canonical}?{query}" if query else canonical
+
+
+def _url_digest(url: str) -> bytes:
+    """Hash a URL's canonical form for compact dedup sets.
+    
+    Args:
+        url: Source URL
+        
+    Returns:
+        8-byte blake2b digest
+    """
+    return hashlib.blake2b(_canonical_url(url).encode(), digest_size=8).digest()
+
 
 class PublisherAgent(CachedAgent):
     """Publisher that extracts events and makes gate decisions."""
@@ -45,16 +193,20 @@ class PublisherAgent(CachedAgent):
             profile = state.get("profile", {})
             leads = state.get("leads", [])
             
+            # Retry cycles add to the cost already recorded for this run
+            metrics = {"llm_cost": state.get("publisher_metrics", {}).get("llm_cost", 0)}
+            
             # Process evidence with LLM
             logger.info(f"Processing {len(evidence)} evidence items...")
-            unique_events = self._process_evidence_with_llm(evidence)
+            unique_events = self._process_evidence_with_llm(evidence, metrics)
             
             # Make gate decision
             logger.info(f"Making gate decision on {len(unique_events)} unique events...")
             gate_result = self._make_gate_decision(
                 events=unique_events,
                 profile=profile,
-                leads=leads
+                leads=leads,
+                metrics=metrics
             )
             
             # Update state based on gate decision
@@ -67,7 +219,7 @@ class PublisherAgent(CachedAgent):
                 state["publisher_metrics"] = {
                     "unique_events_found": len(unique_events),
                     "events_approved": len(final_events),
-                    "llm_cost": self.total_cost
+                    "llm_cost": metrics["llm_cost"]
                 }
                 
                 logger.info(f"Approved {len(final_events)} events for publication")
@@ -79,7 +231,8 @@ class PublisherAgent(CachedAgent):
                 state["publisher_metrics"] = {
                     "unique_events_found": len(unique_events),
                     "events_approved": 0,
-                    "retry_reason": gate_result["feedback"]
+                    "retry_reason": gate_result["feedback"],
+                    "llm_cost": metrics["llm_cost"]
                 }
                 
                 logger.info(f"Requesting retry: {gate_result['feedback']}")
@@ -98,96 +251,53 @@ class PublisherAgent(CachedAgent):
             state["publisher_metrics"] = {"error": str(e)}
             return state
     
-    def _process_evidence_with_llm(self, evidence: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _process_evidence_with_llm(
+        self,
+        evidence: List[Dict[str, Any]],
+        metrics: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """Extract and deduplicate events from evidence using LLM.
         
         Args:
             evidence: List of evidence items from Fact-Checker
+            metrics: Run metrics whose llm_cost accumulates this call's cost
             
         Returns:
             List of unique events
         """
-        # Build prompt for extraction
-        system_prompt = """You are an expert at extracting specific event information from search results.
-
-Your job is to:
-1. Extract concrete events with specific dates (YYYY-MM-DD format)
-2. Deduplicate similar events (keep the most complete version)
-3. Focus on events that photographers can actually attend
-4. Return ONLY the top 15 most promising events
-
-For each event, extract ALL available information:
-- title: Descriptive title that captures what makes this event interesting
-- date: MANDATORY specific date (YYYY-MM-DD format)
-- time: Include if mentioned (e.g., "7:30 PM", "morning", "all day") or make reasonable inference (e.g., "evening" for concerts)
-- location: Specific venue or address (MANDATORY)
-- description: What makes this event visually interesting or newsworthy
-- organizer: Who is organizing (if mentioned)
-- url: Source URL where you found this information (MANDATORY)
-
-GUIDELINES:
-- MUST have specific date and location
-- Time is valuable but not required - include when available or inferable
-- Always include a meaningful description explaining the event's appeal
-- Always include the source URL for verification
-- Deduplicate: combine information from multiple sources about the same event
-- Skip events that already happened or have no specific date
-- LIMIT: Return maximum 15 events"""
-        
         # Format evidence for LLM
         evidence_text = self._format_evidence_for_llm(evidence)
         
-        user_prompt = f"""Extract unique events from these search results:
-
-{evidence_text}
-
-Return the 15 BEST events prioritizing:
-1. Events with specific dates and locations (required)
-2. High photographic/visual potential
-3. Strong news value or cultural significance
-4. Events matching user interests
-
-For each event:
-- Extract time if mentioned, otherwise provide reasonable estimate ("morning", "evening", "all day")
-- Write a brief description explaining WHY this event is interesting
-- Include the source URL where you found the most complete information
-
-Return JSON:
-{{
-    "events": [
-        {{
-            "title": "Descriptive event title",
-            "date": "YYYY-MM-DD",  // REQUIRED
-            "time": "Time if known OR reasonable estimate",
-            "location": "Specific venue/address",  // REQUIRED
-            "description": "What makes this visually interesting",
-            "organizer": "Organization name if mentioned",
-            "access_req": "Public/Press/Ticketed if mentioned",
-            "url": "https://source-url.com"  // REQUIRED
-        }}
-    ]
-}}
-
-Maximum 15 events. Focus on quality over quantity."""
+        user_prompt = EXTRACTION_USER_PROMPT_TEMPLATE.format(evidence_text=evidence_text)
+        
+        # Retry cycles and repeat queries often hand over the same evidence
+        cache_key = "extract_" + hashlib.blake2b(user_prompt.encode(), digest_size=16).hexdigest()
+        cached_events = self.get_from_cache(cache_key)
+        if cached_events is not None:
+            logger.info(f"Using cached extraction for {len(evidence)} evidence items")
+            return cached_events
         
         # Get LLM response
         response = self.llm_client.complete_json(
-            system_prompt=system_prompt,
+            system_prompt=EXTRACTION_SYSTEM_PROMPT,
             user_prompt=user_prompt,
             max_tokens=2500,  # Sufficient for 15 events
             temperature=1.0
         )
         
         # Update cost tracking
-        self.total_cost += response["cost"]
+        self.track_cost(response["cost"], "event extraction", metrics)
         
-        return response["parsed_content"]["events"]
+        events = response["parsed_content"]["events"]
+        self.save_to_cache(cache_key, events)
+        return events
     
     def _make_gate_decision(
         self, 
         events: List[Dict[str, Any]], 
         profile: Dict[str, Any],
-        leads: List[Dict[str, Any]]
+        leads: List[Dict[str, Any]],
+        metrics: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Make gate decision on whether events meet quality threshold.
         
@@ -195,6 +305,7 @@ Maximum 15 events. Focus on quality over quantity."""
             events: Extracted unique events
             profile: User profile with interests
             leads: Original leads from Researcher
+            metrics: Run metrics whose llm_cost accumulates this call's cost
             
         Returns:
             Decision dict with 'decision', 'events', and 'feedback'
@@ -209,23 +320,7 @@ Maximum 15 events. Focus on quality over quantity."""
         # Build prompt for gate decision
         interests = profile.get("interests", ["news", "events"])
         
-        system_prompt = f"""You are a photo editor making decisions about event coverage.
-
-User interests: {', '.join(interests)}
-
-Your job is to evaluate if we have at least 5 HIGH-QUALITY events worth covering.
-
-High-quality events must have:
-1. Specific date (exact YYYY-MM-DD)
-2. Specific location (venue or address)
-3. Clear photographic potential
-4. Relevance to user interests
-
-Time information is valuable but not required - many legitimate events don't announce specific times until closer to the date.
-
-Make a gate decision:
-- APPROVE: If you have 5+ high-quality events
-- RETRY: If quality or quantity is insufficient"""
+        system_prompt = GATE_SYSTEM_PROMPT_TEMPLATE.format(interests=", ".join(interests))
         
         # Format events for evaluation
         events_text = "\n".join([
@@ -233,29 +328,20 @@ Make a gate decision:
             for i, e in enumerate(events)
         ])
         
-        user_prompt = f"""Evaluate these {len(events)} events:
-
-{events_text}
-
-If APPROVE: Return the top 10 events from those provided, scored 0-100 based on:
-- Photographic potential (visual interest, action, emotion)
-- Newsworthiness (timeliness, relevance, impact)
-- Specificity (clear time, location, access info)
-
-If RETRY: Explain what's missing and suggest what to search for.
-
-Return JSON:
-{{
-    "decision": "APPROVE or RETRY",
-    "events": [  // if APPROVE
-        {{
-            "title": "Event title",
-            "score": 85,
-            ...all original fields...
-        }}
-    ],
-    "feedback": "Explanation if RETRY"
-}}"""
+        user_prompt = GATE_USER_PROMPT_TEMPLATE.format(
+            event_count=len(events),
+            events_text=events_text
+        )
+        
+        # The prompts capture everything the decision depends on: interests
+        # and each event's title, date and location
+        cache_key = "gate_" + hashlib.blake2b(
+            f"{system_prompt}\n{user_prompt}".encode(), digest_size=16
+        ).hexdigest()
+        cached_result = self.get_from_cache(cache_key)
+        if cached_result is not None:
+            logger.info(f"Using cached gate decision for {len(events)} events")
+            return cached_result
         
         # Get LLM response
         response = self.llm_client.complete_json(
@@ -266,17 +352,22 @@ Return JSON:
         )
         
         # Update cost tracking
-        self.total_cost += response["cost"]
+        self.track_cost(response["cost"], "gate decision", metrics)
         
         result = response["parsed_content"]
         
-        # If approved, sort by score and take top 10
-        if result["decision"] == "APPROVE" and result.get("events"):
-            result["events"] = sorted(
-                result["events"], 
-                key=lambda x: x.get("score", 0), 
-                reverse=True
-            )[:10]
+        # If approved, keep the top 10 by score (partial sort, O(n log 10))
+        if result["decision"] == "APPROVE":
+            if result.get("events"):
+                result["events"] = heapq.nlargest(
+                    10,
+                    result["events"],
+                    key=lambda x: x.get("score", 0)
+                )
+            
+            # Only approvals are cached: a RETRY sampled at temperature 1.0
+            # must not pin every later run on the same evidence to a retry
+            self.save_to_cache(cache_key, result)
         
         return result
     
@@ -290,6 +381,7 @@ Return JSON:
             Formatted text
         """
         formatted = []
+        seen_urls = set()  # URL digests; leads often surface the same pages, send each source once
         
         for i, item in enumerate(evidence):
             lead = item.get("lead", {})
@@ -297,8 +389,17 @@ Return JSON:
             
             formatted.append(f"\n=== Lead {i+1}: {lead.get('description', 'Unknown')} ===")
             
-            for j, result in enumerate(results[:5]):  # Limit to top 5 results per lead
-                formatted.append(f"\nSource {j+1}: {result.get('url', '')}")
+            source_num = 0
+            for result in results[:5]:  # Limit to top 5 results per lead
+                url = result.get('url', '')
+                if url:
+                    digest = _url_digest(url)
+                    if digest in seen_urls:
+                        continue
+                    seen_urls.add(digest)
+                
+                source_num += 1
+                formatted.append(f"\nSource {source_num}: {url}")
                 formatted.append(f"Title: {result.get('title', '')}")
                 formatted.append(f"Content: {result.get('content', '')[:500]}...")  # Truncate long content
             
@@ -321,19 +422,21 @@ Return JSON:
         for event in events:
             # Ensure all required fields
             # Skip events without dates
-            if not event.get("date") or event.get("date") == "null":
+            date = event.get("date")
+            if not date or date == "null":
                 continue
-                
+            
+            score = event.get("score", 0)
             formatted_event = {
                 "title": event.get("title", "Untitled Event"),
-                "date": event.get("date"),
+                "date": date,
                 "time": event.get("time"),
                 "location": event.get("location", "Location TBD"),
                 "description": event.get("description", ""),
                 "organizer": event.get("organizer"),
                 "url": event.get("url", ""),
-                "score": event.get("score", 0),
-                "interesting": event.get("score", 0) >= 70  # Mark as interesting if score >= 70
+                "score": score,
+                "interesting": score >= 70  # Mark as interesting if score >= 70
             }
             formatted.append(formatted_event)
         
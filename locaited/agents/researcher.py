@@ -2,40 +2,103 @@
 
 import logging
 import json
+import re
 from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 from locaited.agents.base_agent import CachedAgent
+from locaited.config import RESEARCHER_MAX_CONCURRENT_LLM_CALLS
 from locaited.utils.llm_client import get_llm_client
 
 logger = logging.getLogger(__name__)
 
+# Common validation failure patterns, compiled once into one
+# case-insensitive alternation per category
+VALIDATION_FAILURE_PATTERNS = {
+    category: re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+    for category, keywords in {
+        "date_issues": ["outside date range", "no specific date", "already happened", "too far future"],
+        "specificity_issues": ["too generic", "no specific", "vague", "broad"],
+        "verification_issues": ["no source", "can't verify", "no URL", "fake"],
+        "relevance_issues": ["not newsworthy", "not photographic", "not interesting"]
+    }.items()
+}
 
-class ResearcherAgent(CachedAgent):
-    """Researcher that uses LLM to generate specific event leads."""
+_NON_WORD = re.compile(r"\W+")
+
+# Season by month index (January first)
+SEASONS = ("Winter",) * 2 + ("Spring",) * 3 + ("Summer",) * 3 + ("Fall",) * 3 + ("Winter",)
+
+
+@lru_cache(maxsize=128)
+def _classify_time_frame(time_frame: str) -> str:
+    """Classify a free-text time frame into a date window.
     
-    def __init__(self, use_cache: bool = True):
-        """Initialize Researcher agent.
+    Args:
+        time_frame: Time frame such as "this week" or "next 2 weeks"
         
-        Args:
-            use_cache: Whether to use caching
-        """
-        super().__init__(name="researcher", use_cache=use_cache)
-        self.llm_client = get_llm_client(model="gpt-4.1-mini", temperature=1.0)
+    Returns:
+        "this_week", "two_weeks", "week" (other week phrasing) or "other"
+    """
+    time_frame = time_frame.lower()
+    if "week" not in time_frame:
+        return "other"
+    if "this week" in time_frame:
+        return "this_week"
+    if "next 2 weeks" in time_frame or "two weeks" in time_frame:
+        return "two_weeks"
+    return "week"
+
+
+def _dedupe_leads(leads: List[Dict[str, Any]], threshold: float = 0.6) -> List[Dict[str, Any]]:
+    """Drop leads whose description mostly repeats an earlier lead's.
     
-    def _build_system_prompt(self, profile: Dict[str, Any]) -> str:
-        """Build system prompt from user profile.
+    Descriptions are normalized and split into 5-word shingles. A lead is a
+    near-duplicate of a kept lead when the Jaccard similarity of their shingle
+    sets exceeds `threshold`. Leads whose date, time or venue differ are
+    distinct events (e.g. a recurring market on two days) and never merge.
+    
+    Args:
+        leads: Leads in priority order
+        threshold: Shingle-set Jaccard similarity that marks a duplicate
         
-        Args:
-            profile: User profile with preferences
-            
-        Returns:
-            System prompt string
-        """
-        interests = profile.get("interests", ["news", "events"])
-        location = profile.get("location", "New York City")
+    Returns:
+        Unique leads, first occurrence kept
+    """
+    kept = []
+    
+    for lead in leads:
+        words = _NON_WORD.sub(" ", lead.get("description", "").lower()).split()
+        shingles = {" ".join(words[i:i+5]) for i in range(max(1, len(words) - 4))}
+        identity = tuple(
+            str(lead.get(field) or "").strip().lower() for field in ("date", "time", "venue")
+        )
         
-        return f"""You are an expert event researcher for photojournalists in {location}.
+        duplicate = any(
+            kept_identity == identity
+            and len(shingles & kept_shingles) > threshold * len(shingles | kept_shingles)
+            for kept_identity, kept_shingles, _ in kept
+        )
+        if not duplicate:
+            kept.append((identity, shingles, lead))
+    
+    return [lead for _, _, lead in kept]
+
+
+@lru_cache(maxsize=32)
+def _build_system_prompt_for_profile(location: str, interests: tuple) -> str:
+    """Build the researcher system prompt for a profile.
+    
+    Args:
+        location: Profile location
+        interests: Profile interests
+        
+    Returns:
+        System prompt string
+    """
+    return f"""You are an expert event researcher for photojournalists in {location}.
         
 Your job is to generate REAL, VERIFIABLE event leads that photographers can cover.
 Focus on: {', '.join(interests)}
@@ -76,46 +139,39 @@ DO NOT:
 - Make up organization names
 - Invent events that sound plausible but don't exist
 - Create fake venues or locations"""
+
+
+@lru_cache(maxsize=32)
+def _build_user_prompt_for_day(location: str, time_frame: str, today: date) -> str:
+    """Build the event generation user prompt for a given day.
     
-    def _build_user_prompt(self, location: str, time_frame: str) -> str:
-        """Build user prompt for event generation.
+    Args:
+        location: Event location
+        time_frame: Time frame for events
+        today: Current date
         
-        Args:
-            location: Event location
-            time_frame: Time frame for events
-            
-        Returns:
-            User prompt string
-        """
-        # Calculate date context
-        today = datetime.now()
-        week_end = today + timedelta(days=7)
-        two_weeks_end = today + timedelta(days=14)
-        
-        # Get season for context
-        month = today.month
-        if month in [12, 1, 2]:
-            season = "Winter"
-        elif month in [3, 4, 5]:
-            season = "Spring"
-        elif month in [6, 7, 8]:
-            season = "Summer"
-        else:
-            season = "Fall"
-        
-        # Build specific date constraints based on time_frame
-        date_constraint = ""
-        if "week" in time_frame.lower():
-            if "this week" in time_frame.lower():
-                date_constraint = f"ONLY events happening between NOW ({today.strftime('%B %d')}) and {week_end.strftime('%B %d, %Y')}"
-            elif "next 2 weeks" in time_frame.lower() or "two weeks" in time_frame.lower():
-                date_constraint = f"ONLY events happening between NOW ({today.strftime('%B %d')}) and {two_weeks_end.strftime('%B %d, %Y')}"
-            else:
-                date_constraint = f"ONLY events happening in the timeframe: {time_frame}"
-        else:
-            date_constraint = f"ONLY events happening in: {time_frame}"
-        
-        return f"""Generate 25 specific event leads for {location} {time_frame}.
+    Returns:
+        User prompt string
+    """
+    # Calculate date context
+    week_end = today + timedelta(days=7)
+    two_weeks_end = today + timedelta(days=14)
+    
+    # Get season for context
+    season = SEASONS[today.month - 1]
+    
+    # Build specific date constraints based on time_frame
+    window = _classify_time_frame(time_frame)
+    if window == "this_week":
+        date_constraint = f"ONLY events happening between NOW ({today.strftime('%B %d')}) and {week_end.strftime('%B %d, %Y')}"
+    elif window == "two_weeks":
+        date_constraint = f"ONLY events happening between NOW ({today.strftime('%B %d')}) and {two_weeks_end.strftime('%B %d, %Y')}"
+    elif window == "week":
+        date_constraint = f"ONLY events happening in the timeframe: {time_frame}"
+    else:
+        date_constraint = f"ONLY events happening in: {time_frame}"
+    
+    return f"""Generate 25 specific event leads for {location} {time_frame}.
         
 CRITICAL DATE CONTEXT:
 - Today is {today.strftime('%A, %B %d, %Y')}
@@ -148,6 +204,47 @@ Format as JSON list with structure:
 }}
 
 Generate 50 diverse events that photographers would want to cover. Focus on REAL, RECURRING, VERIFIABLE events."""
+
+
+class ResearcherAgent(CachedAgent):
+    """Researcher that uses LLM to generate specific event leads."""
+    
+    def __init__(self, use_cache: bool = True):
+        """Initialize Researcher agent.
+        
+        Args:
+            use_cache: Whether to use caching
+        """
+        super().__init__(name="researcher", use_cache=use_cache)
+        self.llm_client = get_llm_client(model="gpt-4.1-mini", temperature=1.0)
+    
+    def _build_system_prompt(self, profile: Dict[str, Any]) -> str:
+        """Build system prompt from user profile.
+        
+        Args:
+            profile: User profile with preferences
+            
+        Returns:
+            System prompt string
+        """
+        interests = profile.get("interests", ["news", "events"])
+        location = profile.get("location", "New York City")
+        
+        # Same profile, same bytes: reuse the rendered prompt
+        return _build_system_prompt_for_profile(location, tuple(interests))
+    
+    def _build_user_prompt(self, location: str, time_frame: str) -> str:
+        """Build user prompt for event generation.
+        
+        Args:
+            location: Event location
+            time_frame: Time frame for events
+            
+        Returns:
+            User prompt string
+        """
+        # The prompt only depends on the calendar day, so reuse it within a day
+        return _build_user_prompt_for_day(location, time_frame, datetime.now().date())
     
     def _verify_event_reality(self, events: List[Dict], location: str, time_frame: str) -> Dict[str, Any]:
         """Verify if events are real or hallucinated using dedicated LLM check.
@@ -182,13 +279,47 @@ BE VERY STRICT - if you're not sure it's real, mark it as suspicious or hallucin
         verified_events = []
         rejected_events = []
         
-        # Process in batches of 10 to avoid token limits
-        for i in range(0, len(events), 10):
-            batch = events[i:i+10]
+        # Process in batches of 10 to avoid token limits. Batches are
+        # independent LLM calls, so verify them concurrently and merge the
+        # results in batch order.
+        batches = [events[i:i+10] for i in range(0, len(events), 10)]
+        with ThreadPoolExecutor(max_workers=min(RESEARCHER_MAX_CONCURRENT_LLM_CALLS, len(batches))) as executor:
+            futures = [
+                executor.submit(self._verify_batch, batch, system_prompt, time_frame)
+                for batch in batches
+            ]
+            for future in futures:
+                batch_verified, batch_rejected = future.result()
+                verified_events.extend(batch_verified)
+                rejected_events.extend(batch_rejected)
+        
+        return {
+            "verified": verified_events,
+            "rejected": rejected_events,
+            "verification_stats": {
+                "total_checked": len(events),
+                "verified": len(verified_events),
+                "rejected": len(rejected_events)
+            }
+        }
+    
+    def _verify_batch(self, batch: List[Dict], system_prompt: str, time_frame: str) -> tuple:
+        """Verify a single batch of events.
+        
+        Args:
+            batch: Events to verify (at most 10)
+            system_prompt: Fact-checking system prompt
+            time_frame: Time frame
             
-            user_prompt = f"""Verify if these events are REAL or HALLUCINATED:
+        Returns:
+            Tuple of (verified events, rejected events)
+        """
+        verified_events = []
+        rejected_events = []
+        
+        user_prompt = f"""Verify if these events are REAL or HALLUCINATED:
 
-{json.dumps(batch, indent=2)}
+{json.dumps(batch, separators=(",", ":"))}
 
 For each event, determine:
 1. Is the venue/location real? (Google it mentally)
@@ -208,73 +339,65 @@ Return JSON:
         }}
     ]
 }}"""
-            
-            try:
-                response = self.llm_client.complete_json(
-                    system_prompt=system_prompt,
-                    user_prompt=user_prompt,
-                    max_tokens=1500,
-                    schema={
-                        "type": "object",
-                        "required": ["verifications"],
-                        "properties": {
-                            "verifications": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "required": ["event_description", "status", "confidence", "reason"],
-                                    "properties": {
-                                        "event_description": {"type": "string"},
-                                        "status": {"type": "string", "enum": ["REAL", "SUSPICIOUS", "HALLUCINATED"]},
-                                        "confidence": {"type": "integer"},
-                                        "reason": {"type": "string"},
-                                        "suggested_search": {"type": "string"}
-                                    }
+        
+        try:
+            response = self.llm_client.complete_json(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=1500,
+                schema={
+                    "type": "object",
+                    "required": ["verifications"],
+                    "properties": {
+                        "verifications": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "required": ["event_description", "status", "confidence", "reason"],
+                                "properties": {
+                                    "event_description": {"type": "string"},
+                                    "status": {"type": "string", "enum": ["REAL", "SUSPICIOUS", "HALLUCINATED"]},
+                                    "confidence": {"type": "integer"},
+                                    "reason": {"type": "string"},
+                                    "suggested_search": {"type": "string"}
                                 }
                             }
                         }
                     }
-                )
-                
-                verifications = response["parsed_content"]["verifications"]
-                
-                # Match verifications back to original events
-                for j, verification in enumerate(verifications):
-                    if j < len(batch):
-                        original_event = batch[j]
-                        if verification["status"] == "REAL" and verification["confidence"] >= 70:
-                            original_event["verification_status"] = "verified"
-                            original_event["confidence_score"] = verification["confidence"]
-                            verified_events.append(original_event)
-                        elif verification["status"] == "SUSPICIOUS" and verification["confidence"] >= 50:
-                            # Give suspicious events a chance with modified search
-                            original_event["verification_status"] = "needs_verification"
-                            original_event["confidence_score"] = verification["confidence"]
-                            if verification.get("suggested_search"):
-                                original_event["search_query"] = verification["suggested_search"]
-                            verified_events.append(original_event)
-                        else:
-                            original_event["rejection_reason"] = verification["reason"]
-                            rejected_events.append(original_event)
-                
-                logger.info(f"Verified batch: {len([v for v in verifications if v['status'] == 'REAL'])} real, "
-                          f"{len([v for v in verifications if v['status'] == 'SUSPICIOUS'])} suspicious, "
-                          f"{len([v for v in verifications if v['status'] == 'HALLUCINATED'])} hallucinated")
-                
-            except Exception as e:
-                logger.error(f"Verification failed for batch: {e}")
-                # If verification fails, be conservative and reject the batch
-                rejected_events.extend(batch)
+                }
+            )
+            
+            verifications = response["parsed_content"]["verifications"]
+            
+            # Match verifications back to original events
+            for j, verification in enumerate(verifications):
+                if j < len(batch):
+                    original_event = batch[j]
+                    if verification["status"] == "REAL" and verification["confidence"] >= 70:
+                        original_event["verification_status"] = "verified"
+                        original_event["confidence_score"] = verification["confidence"]
+                        verified_events.append(original_event)
+                    elif verification["status"] == "SUSPICIOUS" and verification["confidence"] >= 50:
+                        # Give suspicious events a chance with modified search
+                        original_event["verification_status"] = "needs_verification"
+                        original_event["confidence_score"] = verification["confidence"]
+                        if verification.get("suggested_search"):
+                            original_event["search_query"] = verification["suggested_search"]
+                        verified_events.append(original_event)
+                    else:
+                        original_event["rejection_reason"] = verification["reason"]
+                        rejected_events.append(original_event)
+            
+            logger.info(f"Verified batch: {len([v for v in verifications if v['status'] == 'REAL'])} real, "
+                      f"{len([v for v in verifications if v['status'] == 'SUSPICIOUS'])} suspicious, "
+                      f"{len([v for v in verifications if v['status'] == 'HALLUCINATED'])} hallucinated")
+            
+        except Exception as e:
+            logger.error(f"Verification failed for batch: {e}")
+            # If verification fails, be conservative and reject the batch
+            rejected_events.extend(batch)
         
-        return {
-            "verified": verified_events,
-            "rejected": rejected_events,
-            "verification_stats": {
-                "total_checked": len(events),
-                "verified": len(verified_events),
-                "rejected": len(rejected_events)
-            }
-        }
+        return verified_events, rejected_events
     
     def _expand_generic_events(self, generic_events: List[Dict], location: str, date_range: tuple) -> List[Dict]:
         """Expand generic events into specific, photographable sub-events.
@@ -295,18 +418,22 @@ Return JSON:
         
         # Process in batches of 3 to avoid JSON parsing issues (reduced from 5 to prevent truncation)
         batch_size = 3
-        total_batches = (len(generic_events) + batch_size - 1) // batch_size
+        batches = [generic_events[i:i+batch_size] for i in range(0, len(generic_events), batch_size)]
+        total_batches = len(batches)
+        logger.info(f"RESEARCHER PROGRESS: Expanding {total_batches} batches of generic events in parallel...")
         
-        for i in range(0, len(generic_events), batch_size):
-            batch_num = (i // batch_size) + 1
-            batch = generic_events[i:i+batch_size]
-            logger.info(f"RESEARCHER PROGRESS: Expanding batch {batch_num}/{total_batches} ({len(batch)} generic events)...")
-            
-            expanded_batch = self._expand_generic_batch(batch, location, start_date, end_date)
-            all_expanded.extend(expanded_batch)
-            
-            if expanded_batch:
-                logger.info(f"Batch {batch_num} expanded into {len(expanded_batch)} specific events")
+        # Batches are independent LLM calls; fan them out and merge in batch order
+        with ThreadPoolExecutor(max_workers=min(RESEARCHER_MAX_CONCURRENT_LLM_CALLS, total_batches)) as executor:
+            futures = [
+                executor.submit(self._expand_generic_batch, batch, location, start_date, end_date)
+                for batch in batches
+            ]
+            for batch_num, future in enumerate(futures, 1):
+                expanded_batch = future.result()
+                all_expanded.extend(expanded_batch)
+                
+                if expanded_batch:
+                    logger.info(f"Batch {batch_num}/{total_batches} expanded into {len(expanded_batch)} specific events")
             
         return all_expanded
     
@@ -335,7 +462,7 @@ Requirements:
 
         user_prompt = f"""These generic events were found for {location}. Find SPECIFIC sub-events within them:
 
-{json.dumps(generic_events, indent=2)}
+{json.dumps(generic_events, separators=(",", ":"))}
 
 For each generic event, find 2-3 specific, photographable moments happening between {start_date.strftime('%B %d')} and {end_date.strftime('%B %d, %Y')}.
 
@@ -414,24 +541,16 @@ Format as JSON:
         Returns:
             Analysis dict with failure patterns and suggestions
         """
-        # Common failure patterns
-        patterns = {
-            "date_issues": ["outside date range", "no specific date", "already happened", "too far future"],
-            "specificity_issues": ["too generic", "no specific", "vague", "broad"],
-            "verification_issues": ["no source", "can't verify", "no URL", "fake"],
-            "relevance_issues": ["not newsworthy", "not photographic", "not interesting"]
-        }
-        
         analysis = {
             "main_issues": [],
             "suggestions": []
         }
         
         # Analyze validation notes
-        notes_text = " ".join(validation_notes).lower()
+        notes_text = " ".join(validation_notes)
         
-        for category, keywords in patterns.items():
-            if any(keyword in notes_text for keyword in keywords):
+        for category, pattern in VALIDATION_FAILURE_PATTERNS.items():
+            if pattern.search(notes_text):
                 analysis["main_issues"].append(category)
                 
         # Generate improvement suggestions based on issues
@@ -565,7 +684,7 @@ Generate 15 diverse, PLAUSIBLE events."""
             Tuple of (system_prompt, user_prompt)
         """
         today = datetime.now()
-        end_date = today + timedelta(days=7) if "week" in time_frame.lower() else today + timedelta(days=14)
+        end_date = today + timedelta(days=14 if _classify_time_frame(time_frame) == "other" else 7)
         interests = profile.get("interests", ["news", "events"])
         
         system_prompt = f"""You are an expert event researcher for photojournalists in {location}.
@@ -636,16 +755,7 @@ Format as JSON:
         interests = profile.get("interests", ["news", "events"])
         
         # Calculate exact date range
-        end_date = today
-        if "week" in time_frame.lower():
-            if "this week" in time_frame.lower():
-                end_date = today + timedelta(days=7)
-            elif "next 2 weeks" in time_frame.lower() or "two weeks" in time_frame.lower():
-                end_date = today + timedelta(days=14)
-            else:
-                end_date = today + timedelta(days=7)
-        else:
-            end_date = today + timedelta(days=7)
+        end_date = today + timedelta(days=14 if _classify_time_frame(time_frame) == "two_weeks" else 7)
         
         # Adjust validation strictness based on lenient mode
         if lenient:
@@ -759,7 +869,7 @@ Return events in this format:
             
             validation_user_prompt = f"""Validate these {batch_size} event leads for {location}:
 
-{json.dumps(batch_events, indent=2)}
+{json.dumps(batch_events, separators=(",", ":"))}
 
 CRITICAL CONTEXT:
 - Today: {today.strftime('%A, %B %d, %Y')}
@@ -966,6 +1076,10 @@ Return all three categories so we can expand the generic ones into specific oppo
             
             # Step 2: First check for hallucinations
             initial_events = initial_response["parsed_content"]["events"]
+            
+            # Every lead costs verification, validation and a Tavily search
+            # downstream, so drop near-duplicates up front
+            initial_events = _dedupe_leads(initial_events)
             logger.info(f"RESEARCHER PROGRESS: Step 2/4 - Checking {len(initial_events)} events for hallucinations...")
             
             verification_result = self._verify_event_reality(initial_events, location, time_frame)
@@ -982,6 +1096,11 @@ Return all three categories so we can expand the generic ones into specific oppo
                 leads = []
                 validation_result = {"events": [], "cost": 0, "total_tokens": 0, "elapsed_time": 0}
             
+            # Running totals across all phases, including any retries below
+            total_cost = initial_response["cost"] + validation_result["cost"]
+            total_tokens = initial_response["total_tokens"] + validation_result["total_tokens"]
+            total_time = initial_response["elapsed_time"] + validation_result["elapsed_time"]
+            
             # Step 3: If we got fewer than 5 leads, analyze failures and try again with smarter approach
             if len(leads) < 5:
                 logger.warning(f"Only {len(leads)} leads passed validation, analyzing failures...")
@@ -1039,16 +1158,19 @@ Return all three categories so we can expand the generic ones into specific oppo
                 unique_leads = []
                 seen_descriptions = set()
                 for lead in leads:
-                    desc_key = lead["description"].lower()[:50]  # Use first 50 chars as key
+                    # Lowercase only the 50-char key, not the whole description
+                    desc_key = lead["description"][:50].lower()
                     if desc_key not in seen_descriptions:
                         unique_leads.append(lead)
                         seen_descriptions.add(desc_key)
-                leads = unique_leads[:15]  # Keep top 15 unique leads
+                        if len(unique_leads) == 15:  # Keep top 15 unique leads
+                            break
+                leads = unique_leads
                 
                 # Update combined costs
-                total_cost = initial_response["cost"] + validation_result["cost"] + retry_response["cost"] + retry_validation["cost"]
-                total_tokens = initial_response["total_tokens"] + validation_result["total_tokens"] + retry_response["total_tokens"] + retry_validation["total_tokens"]
-                total_time = initial_response["elapsed_time"] + validation_result["elapsed_time"] + retry_response["elapsed_time"] + retry_validation["elapsed_time"]
+                total_cost += retry_response["cost"] + retry_validation["cost"]
+                total_tokens += retry_response["total_tokens"] + retry_validation["total_tokens"]
+                total_time += retry_response["elapsed_time"] + retry_validation["elapsed_time"]
                 
                 # If still too few, try one more time with very lenient approach
                 if len(leads) < 3:
@@ -1091,11 +1213,8 @@ Return all three categories so we can expand the generic ones into specific oppo
                     total_tokens += final_response["total_tokens"] + final_validation["total_tokens"]
                     total_time += final_response["elapsed_time"] + final_validation["elapsed_time"]
             
-            # Combine metrics from all phases (if no retries, this is the original calculation)
-            if 'total_cost' not in locals():
-                total_cost = initial_response["cost"] + validation_result["cost"]
-                total_tokens = initial_response["total_tokens"] + validation_result["total_tokens"]
-                total_time = initial_response["elapsed_time"] + validation_result["elapsed_time"]
+            # Retry rounds can re-propose leads we already have
+            leads = _dedupe_leads(leads)
             
             # Track comprehensive metrics
             metrics = {
@@ -1122,7 +1241,7 @@ Return all three categories so we can expand the generic ones into specific oppo
             }
             
             # Update cost tracking
-            self.total_cost += total_cost
+            self.track_cost(total_cost, "lead generation")
             
             # Save to cache
             result = {"leads": leads, "metrics": metrics}
@@ -1144,8 +1263,7 @@ Return all three categories so we can expand the generic ones into specific oppo
             logger.error(f"Error generating leads: {e}")
             self.errors.append({
                 "timestamp": datetime.now().isoformat(),
-                "error": str(e),
-                "state": state
+                "error": str(e)
             })
             
             # Return empty leads on error
@@ -1,16 +1,16 @@
 """Workflow - LangGraph orchestration with retry logic."""
 
+from __future__ import annotations
+
 import logging
-from typing import Dict, Any, TypedDict, List, Optional
+import time
+from typing import Dict, Any, TypedDict, List, Optional, TYPE_CHECKING
 from datetime import datetime
 
-from langgraph.graph import StateGraph, END
-from langgraph.graph.state import CompiledStateGraph
-
-from locaited.agents.editor import EditorAgent
-from locaited.agents.researcher import ResearcherAgent
-from locaited.agents.fact_checker import FactCheckerAgent
-from locaited.agents.publisher import PublisherAgent
+# LangGraph and the agents (OpenAI, Tavily clients) take over a second to
+# import; they are loaded when a Workflow is built, not when this module is
+if TYPE_CHECKING:
+    from langgraph.graph.state import CompiledStateGraph
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +59,11 @@ class Workflow:
         """
         logger.info("Initializing Workflow v0.4.0...")
         
+        from locaited.agents.editor import EditorAgent
+        from locaited.agents.researcher import ResearcherAgent
+        from locaited.agents.fact_checker import FactCheckerAgent
+        from locaited.agents.publisher import PublisherAgent
+        
         # Initialize agents
         self.editor = EditorAgent()
         self.researcher = ResearcherAgent(use_cache=use_cache)
@@ -76,6 +81,8 @@ class Workflow:
         Returns:
             Compiled workflow graph
         """
+        from langgraph.graph import StateGraph, END
+        
         # Create state graph
         workflow = StateGraph(WorkflowState)
         
@@ -115,6 +122,8 @@ class Workflow:
         Returns:
             Next node name or END
         """
+        from langgraph.graph import END
+        
         gate_decision = state.get("gate_decision", "ERROR")
         should_retry = state.get("should_retry", True)
         
@@ -138,12 +147,19 @@ class Workflow:
     def run_workflow(self, user_input: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the workflow with user input.
         
+        The first pass calls the agents directly; most runs are approved on
+        it. Only a RETRY the Editor still allows continues in the compiled
+        graph, which owns the Publisher -> Editor retry loop.
+        
         Args:
             user_input: Dict with location, time_frame, interests
             
         Returns:
             Final state with events or error information
         """
+        # Monotonic clock for the duration; ISO timestamps are for display only
+        start = time.monotonic()
+        
         try:
             # Initialize state
             initial_state = WorkflowState(
@@ -154,14 +170,20 @@ class Workflow:
             
             logger.info(f"Starting workflow for: {user_input}")
             
-            # Run workflow (handles retries internally)
-            final_state = self.workflow.invoke(initial_state)
+            final_state = self._run_single_pass(initial_state)
+            
+            if self._route_publisher_decision(final_state) == "editor":
+                # Resume at the Editor with this pass's feedback (graph
+                # entry point); the graph handles any further retries
+                final_state = self.workflow.invoke(final_state)
             
             # Add completion time
             final_state["workflow_end_time"] = datetime.now().isoformat()
             
             # Collect and add workflow metrics
-            final_state["workflow_metrics"] = self._collect_workflow_metrics(final_state)
+            final_state["workflow_metrics"] = self._collect_workflow_metrics(
+                final_state, time.monotonic() - start
+            )
             
             # Log results
             if final_state.get("gate_decision") == "APPROVE":
@@ -182,11 +204,25 @@ class Workflow:
                 "workflow_end_time": datetime.now().isoformat()
             }
     
-    def _collect_workflow_metrics(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def _run_single_pass(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Run each agent once, without graph dispatch or retry routing.
+        
+        Args:
+            state: Initial workflow state
+            
+        Returns:
+            Final state after the Publisher; run_workflow routes a RETRY
+        """
+        for agent in (self.editor, self.researcher, self.fact_checker, self.publisher):
+            state = agent.process(state)
+        return state
+    
+    def _collect_workflow_metrics(self, state: Dict[str, Any], duration: float) -> Dict[str, Any]:
         """Collect metrics from state and agents.
         
         Args:
             state: Final workflow state
+            duration: Workflow wall time in seconds
             
         Returns:
             Combined metrics
@@ -202,11 +238,6 @@ class Workflow:
         if state.get("publisher_metrics", {}).get("llm_cost"):
             total_cost += state["publisher_metrics"]["llm_cost"]
         
-        # Calculate duration
-        start_time = datetime.fromisoformat(state["workflow_start_time"])
-        end_time = datetime.fromisoformat(state["workflow_end_time"])
-        duration = (end_time - start_time).total_seconds()
-        
         return {
             "total_cost": total_cost,
             "total_duration_seconds": duration,
@@ -218,7 +249,10 @@ class Workflow:
         }
     
     def get_metrics(self) -> Dict[str, Any]:
-        """Get metrics from all agents.
+        """Get lifetime metrics from all agents.
+        
+        Per-run costs are in each run's workflow_metrics; these totals cover
+        every run on this Workflow.
         
         Returns:
             Combined metrics from all agents
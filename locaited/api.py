@@ -3,12 +3,15 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import sys
 import json
 import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 
 # No longer need to modify sys.path with proper package installation
@@ -18,7 +21,8 @@ from locaited.agents.researcher import ResearcherAgent
 from locaited.agents.fact_checker import FactCheckerAgent
 from locaited.agents.publisher import PublisherAgent
 from locaited.cache_manager import CacheManager
-from locaited.database import SessionLocal, Event, User, Recommendation
+from locaited.config import CACHE_CLEANUP_INTERVAL_SECONDS
+from locaited.database import SessionLocal, User, Recommendation, RECENT_EVENTS_STMT
 from locaited.utils.debug_formatters import (
     format_editor_output,
     format_researcher_output,
@@ -27,7 +31,27 @@ from locaited.utils.debug_formatters import (
     format_error_output
 )
 
-app = FastAPI(title="LocAIted API", version="1.0.0")
+async def _cache_cleanup_loop():
+    """Periodically remove expired cache files without blocking requests."""
+    while True:
+        await asyncio.sleep(CACHE_CLEANUP_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(cache.clear_expired_cache)
+        except Exception as e:
+            print(f"Cache cleanup failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the cache cleanup loop for the lifetime of the app."""
+    cleanup_task = asyncio.create_task(_cache_cleanup_loop())
+    try:
+        yield
+    finally:
+        cleanup_task.cancel()
+
+
+app = FastAPI(title="LocAIted API", version="1.0.0", lifespan=lifespan)
 
 # Enable CORS for UI
 app.add_middleware(
@@ -41,6 +65,37 @@ app.add_middleware(
 # Cache manager instance
 cache = CacheManager()
 
+
+@lru_cache(maxsize=2)
+def _get_workflow(use_cache: bool):
+    """Build the workflow once per cache setting and reuse it across requests.
+    
+    Agents and the compiled graph hold no per-run state (each run's costs
+    travel in its workflow state), so concurrent runs can share them.
+    
+    Args:
+        use_cache: Whether agents should use caching
+        
+    Returns:
+        Shared Workflow instance
+    """
+    from locaited.agents.workflow import Workflow
+    
+    return Workflow(use_cache=use_cache)
+
+
+def _run_workflow(use_cache: bool, user_input: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the shared workflow for one request (blocking).
+    
+    Args:
+        use_cache: Whether agents should use caching
+        user_input: Workflow input with location, time frame and interests
+        
+    Returns:
+        Final workflow state
+    """
+    return _get_workflow(use_cache).run_workflow(user_input)
+
 # Request/Response Models
 class SearchRequest(BaseModel):
     query: str
@@ -101,10 +156,11 @@ async def get_cache_stats():
     return cache.get_cache_stats()
 
 @app.post("/cache/clear")
-async def clear_expired_cache():
-    """Clear expired cache entries."""
-    removed = cache.clear_expired_cache()
-    return {"removed_entries": removed}
+async def clear_expired_cache(background_tasks: BackgroundTasks):
+    """Clear expired cache entries in the background."""
+    # The directory walk can touch thousands of files; respond immediately
+    background_tasks.add_task(cache.clear_expired_cache)
+    return {"status": "scheduled"}
 
 @app.post("/profile/build", response_model=ProfileResponse)
 async def build_profile(request: ProfileRequest):
@@ -331,9 +387,6 @@ async def run_workflow(request: SearchRequest):
 async def discover_events(request: ExtendedSearchRequest):
     """Single-flow endpoint for UI: accepts profile + query, runs v0.4.0 workflow."""
     try:
-        # Import workflow
-        from locaited.agents.workflow import Workflow
-        
         # Use custom location if provided
         location = request.custom_location if request.custom_location else request.location
         
@@ -352,9 +405,16 @@ async def discover_events(request: ExtendedSearchRequest):
             "query": request.query
         }
         
-        # Initialize and run workflow
-        workflow = Workflow(use_cache=request.use_cache)
-        result = workflow.run_workflow(user_input)
+        # The workflow blocks on LLM and Tavily calls; keep it off the event loop
+        async def compute():
+            return await run_in_threadpool(_run_workflow, request.use_cache, user_input)
+        
+        if request.use_cache:
+            # Identical requests arriving while a run is in flight share it
+            flight_key = "discover_" + cache._generate_cache_key(user_input)
+            result = await cache.get_or_compute(flight_key, compute)
+        else:
+            result = await compute()
         
         # Format events for response
         events = []
@@ -396,31 +456,43 @@ async def discover_events(request: ExtendedSearchRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _load_recent_events(limit: int) -> List[EventResponse]:
+    """Load the most recent events from the database (blocking).
+    
+    Args:
+        limit: Maximum number of events to return
+        
+    Returns:
+        Events as response models, newest first
+    """
+    db = SessionLocal()
+    try:
+        events = db.execute(RECENT_EVENTS_STMT.limit(limit)).scalars().all()
+        
+        response = []
+        for event in events:
+            response.append(EventResponse(
+                title=event.title,
+                location=event.location or "",
+                time=event.start_time.isoformat() if event.start_time else None,
+                url=event.url or "",
+                access_req=event.access_req or "unknown",
+                summary=event.summary or "",
+                score=0.5  # Default score
+            ))
+        
+        return response
+        
+    finally:
+        db.close()
+
 @app.get("/events/recent", response_model=List[EventResponse])
 async def get_recent_events(limit: int = 10):
     """Get recently processed events from database."""
     try:
-        db = SessionLocal()
-        try:
-            events = db.query(Event).order_by(Event.created_at.desc()).limit(limit).all()
-            
-            response = []
-            for event in events:
-                response.append(EventResponse(
-                    title=event.title,
-                    location=event.location,
-                    time=event.start_time.isoformat() if event.start_time else None,
-                    url=event.source_url,
-                    access_req=event.access_requirements or "unknown",
-                    summary=event.description or "",
-                    score=0.5  # Default score
-                ))
-            
-            return response
-            
-        finally:
-            db.close()
-            
+        # SQLAlchemy session I/O and row loading are synchronous
+        return await run_in_threadpool(_load_recent_events, limit)
+        
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -446,9 +518,6 @@ async def discover_events_debug(request: ExtendedSearchRequest):
     
     async def event_stream():
         try:
-            # Import workflow
-            from locaited.agents.workflow import Workflow
-            
             # Use custom location if provided
             location = request.custom_location if request.custom_location else request.location
             
@@ -463,12 +532,14 @@ async def discover_events_debug(request: ExtendedSearchRequest):
             # Send initial event
             yield f"data: {json.dumps({'event': 'session_start', 'session_id': session_id, 'user_input': user_input})}\n\n"
             
-            # Initialize workflow components with cache preference
+            # Reuse the shared workflow's agents; each run's costs live in
+            # its own state, so paused sessions don't affect other runs
             use_cache = request.use_cache if hasattr(request, 'use_cache') else True
-            editor = EditorAgent()
-            researcher = ResearcherAgent(use_cache=use_cache)
-            fact_checker = FactCheckerAgent(use_cache=use_cache)
-            publisher = PublisherAgent(use_cache=use_cache)
+            workflow = await run_in_threadpool(_get_workflow, use_cache)
+            editor = workflow.editor
+            researcher = workflow.researcher
+            fact_checker = workflow.fact_checker
+            publisher = workflow.publisher
             
             # Initialize state
             state = {"user_input": f"{user_input['query']} in {user_input['location']} for {user_input['time_frame']}"}
@@ -479,7 +550,9 @@ async def discover_events_debug(request: ExtendedSearchRequest):
             
             try:
                 start_time = datetime.now()
-                state = editor.process(state)
+                # Each agent step blocks on LLM/Tavily calls; run it in the
+                # threadpool so the stream and continue/stop signals stay live
+                state = await run_in_threadpool(editor.process, state)
                 end_time = datetime.now()
                 
                 # Add timing metrics
@@ -487,7 +560,7 @@ async def discover_events_debug(request: ExtendedSearchRequest):
                 state["editor_metrics"]["elapsed_time"] = (end_time - start_time).total_seconds()
                 
                 # Format and send editor results
-                formatted_output = format_editor_output(state)
+                formatted_output = format_editor_output(state, verbose=True)
                 yield f"data: {json.dumps({'event': 'agent_complete', 'agent': 'editor', 'data': formatted_output})}\n\n"
                 
                 # Wait for continue signal
@@ -510,7 +583,7 @@ async def discover_events_debug(request: ExtendedSearchRequest):
             
             try:
                 start_time = datetime.now()
-                state = researcher.process(state)
+                state = await run_in_threadpool(researcher.process, state)
                 end_time = datetime.now()
                 
                 # Add timing metrics
@@ -518,7 +591,7 @@ async def discover_events_debug(request: ExtendedSearchRequest):
                 state["researcher_metrics"]["elapsed_time"] = (end_time - start_time).total_seconds()
                 
                 # Format and send researcher results
-                formatted_output = format_researcher_output(state)
+                formatted_output = format_researcher_output(state, verbose=True)
                 yield f"data: {json.dumps({'event': 'agent_complete', 'agent': 'researcher', 'data': formatted_output})}\n\n"
                 
                 # Wait for continue signal
@@ -541,7 +614,7 @@ async def discover_events_debug(request: ExtendedSearchRequest):
             
             try:
                 start_time = datetime.now()
-                state = fact_checker.process(state)
+                state = await run_in_threadpool(fact_checker.process, state)
                 end_time = datetime.now()
                 
                 # Add timing metrics
@@ -549,7 +622,7 @@ async def discover_events_debug(request: ExtendedSearchRequest):
                 state["fact_checker_metrics"]["elapsed_time"] = (end_time - start_time).total_seconds()
                 
                 # Format and send fact-checker results
-                formatted_output = format_fact_checker_output(state)
+                formatted_output = format_fact_checker_output(state, verbose=True)
                 yield f"data: {json.dumps({'event': 'agent_complete', 'agent': 'fact_checker', 'data': formatted_output})}\n\n"
                 
                 # Wait for continue signal
@@ -572,7 +645,7 @@ async def discover_events_debug(request: ExtendedSearchRequest):
             
             try:
                 start_time = datetime.now()
-                state = publisher.process(state)
+                state = await run_in_threadpool(publisher.process, state)
                 end_time = datetime.now()
                 
                 # Add timing metrics
@@ -580,7 +653,7 @@ async def discover_events_debug(request: ExtendedSearchRequest):
                 state["publisher_metrics"]["elapsed_time"] = (end_time - start_time).total_seconds()
                 
                 # Format and send publisher results
-                formatted_output = format_publisher_output(state)
+                formatted_output = format_publisher_output(state, verbose=True)
                 yield f"data: {json.dumps({'event': 'agent_complete', 'agent': 'publisher', 'data': formatted_output})}\n\n"
                 
                 # Final completion
@@ -1,17 +1,28 @@
 """Cache manager for LocAIted to save API credits."""
 
+import asyncio
 import hashlib
-import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-import pickle
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
 
-from config import PROJECT_ROOT
+import orjson
+
+from locaited.config import PROJECT_ROOT
 
 class CacheManager:
     """Manages caching for API calls to save credits."""
     
+    # Entries kept in the in-process LRU in front of the cache files
+    MEMORY_CACHE_SIZE = 512
+    
+    # get_cache_stats walks every cache file; polled stats reuse a recent scan
+    STATS_TTL_SECONDS = 30
+    
     def __init__(self, cache_dir: Optional[Path] = None, ttl_hours: int = 24):
         """
         Initialize cache manager.
@@ -31,23 +42,234 @@ class CacheManager:
         
         for dir in [self.search_cache_dir, self.extract_cache_dir, self.llm_cache_dir]:
             dir.mkdir(exist_ok=True)
+        
+        # cache file -> (saved_at epoch seconds, orjson-encoded value); shared
+        # by request threads. Hits decode a fresh copy, so a caller mutating
+        # its result can't corrupt later hits.
+        self._memory: "OrderedDict[Path, Tuple[float, bytes]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        
+        # (scanned_at epoch seconds, stats) from the last directory walk
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        
+        # cache key -> task for a computation in progress; event-loop only
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     def _generate_cache_key(self, data: Dict[str, Any]) -> str:
         """Generate a unique cache key from input data."""
-        # Sort keys for consistent hashing
-        sorted_data = json.dumps(data, sort_keys=True, default=str)
-        return hashlib.sha256(sorted_data.encode()).hexdigest()[:16]
+        # Sort keys for consistent hashing; orjson serializes datetimes natively.
+        # OPT_NON_STR_KEYS accepts int and other non-str keys as json.dumps did
+        sorted_data = orjson.dumps(
+            data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        )
+        # Filenames only need collision resistance, not a cryptographic hash;
+        # an 8-byte blake2b digest keeps the 16-hex-char key length
+        return hashlib.blake2b(sorted_data, digest_size=8).hexdigest()
+    
+    def _url_key(self, url: str) -> str:
+        """Generate the cache key for a URL without a JSON round-trip."""
+        return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+    
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run an expensive computation once for concurrent callers with the same key.
+        
+        The first caller starts compute() as a task; callers arriving before
+        it finishes await the same result (or exception) instead of paying
+        for their own. Every caller, the first included, awaits the task
+        through a shield, so any one of them disconnecting doesn't cancel
+        the work the others are waiting on.
+        
+        Args:
+            key: Identifies the computation
+            compute: Coroutine function producing the value
+            
+        Returns:
+            The computed value
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task  # Also keeps the running task referenced
+            
+            def _finished(done: asyncio.Future):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+                if not done.cancelled():
+                    done.exception()  # Mark retrieved when every caller has gone
+            
+            task.add_done_callback(_finished)
+        
+        return await asyncio.shield(task)
+    
+    def _search_key(self,
+                    query: str,
+                    keywords: List[str],
+                    domains: List[str],
+                    location: str) -> Tuple[Dict[str, Any], str, Path]:
+        """Build the cache parameters, key and file for a search.
+        
+        Returns:
+            (cache_data, cache_key, cache_file) tuple
+        """
+        cache_data = {
+            "query": query,
+            "keywords": sorted(keywords[:10]),  # Limit and sort for consistency
+            "domains": sorted(domains[:10]),
+            "location": location
+        }
+        
+        cache_key = self._generate_cache_key(cache_data)
+        return cache_data, cache_key, self._shard_path(self.search_cache_dir, cache_key)
+    
+    @staticmethod
+    def _canonical_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reduce events to the fields that identify them for LLM caching.
+        
+        Args:
+            events: Events to be scored
+            
+        Returns:
+            List of title/location/truncated summary dicts
+        """
+        return [
+            {
+                "title": e.get("title"),
+                "location": e.get("location"),
+                "summary": (e.get("summary") or "")[:100]
+            }
+            for e in events
+        ]
+    
+    def _llm_key(self,
+                 events: List[Dict[str, Any]],
+                 user_profile: Dict[str, Any]) -> Tuple[Dict[str, Any], str, Path]:
+        """Build the cache parameters, key and file for LLM scoring.
+        
+        Returns:
+            (cache_data, cache_key, cache_file) tuple
+        """
+        # Create cache key from events and profile
+        cache_data = {
+            "events": self._canonical_events(events),
+            "interests": user_profile.get("interest_areas", []),
+            "keywords": sorted(user_profile.get("keywords", [])[:10])
+        }
+        
+        cache_key = self._generate_cache_key(cache_data)
+        return cache_data, cache_key, self._shard_path(self.llm_cache_dir, cache_key)
+    
+    def _shard_path(self, cache_dir: Path, cache_key: str) -> Path:
+        """Get the cache file for a key, sharded by its first two hex chars.
+        
+        Args:
+            cache_dir: Cache type directory
+            cache_key: Hex cache key
+            
+        Returns:
+            Path of the form cache_dir/ab/abcdef....json
+        """
+        return cache_dir / cache_key[:2] / f"{cache_key}.json"
+    
+    def _iter_cache_files(self, cache_dir: Path):
+        """Yield a DirEntry for every file under a cache type directory.
+        
+        Walks the shard subdirectories as well as any unsharded files
+        written before sharding was introduced. Directories removed during
+        the walk (e.g. by a concurrent cleanup) are skipped.
+        
+        Args:
+            cache_dir: Cache type directory
+        """
+        try:
+            entries = os.scandir(cache_dir)
+        except OSError:
+            return
+        
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_cache_files(Path(entry.path))
+                else:
+                    yield entry
     
     def _is_cache_valid(self, cache_file: Path) -> bool:
         """Check if cache file is still valid based on TTL."""
-        if not cache_file.exists():
-            return False
+        return self._valid_mtime(cache_file) is not None
+    
+    def _valid_mtime(self, cache_file: Path) -> Optional[float]:
+        """Get a cache file's mtime if it exists and is within the TTL.
         
-        # Check file age
-        file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
-        age = datetime.now() - file_time
+        Args:
+            cache_file: Cache file path
+            
+        Returns:
+            Modification time in epoch seconds, or None if missing/expired
+        """
+        try:
+            mtime = cache_file.stat().st_mtime
+        except OSError:
+            return None
+        
+        if time.time() - mtime < self.ttl.total_seconds():
+            return mtime
+        return None
+    
+    def _write_atomic(self, cache_file: Path, payload: Any, **kwargs):
+        """Write a cache entry so readers never see a partial file.
+        
+        Args:
+            cache_file: Destination cache file
+            payload: Data to serialize with orjson
+            **kwargs: Extra arguments for orjson.dumps
+        """
+        # Unique per process and thread; os.replace is atomic on POSIX and Windows
+        tmp_file = cache_file.with_name(f"{cache_file.name}.tmp{os.getpid()}-{threading.get_ident()}")
+        cache_file.parent.mkdir(exist_ok=True)
+        try:
+            tmp_file.write_bytes(orjson.dumps(payload, **kwargs))
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            tmp_file.unlink(missing_ok=True)
+            raise
+    
+    def _memory_get(self, cache_file: Path) -> Optional[Tuple[float, Any]]:
+        """Look up a cache entry in memory.
+        
+        Args:
+            cache_file: Cache file path the entry belongs to
+            
+        Returns:
+            (saved_at, value) tuple, or None if absent or expired
+        """
+        with self._memory_lock:
+            entry = self._memory.get(cache_file)
+            if entry is None:
+                return None
+            
+            if time.time() - entry[0] >= self.ttl.total_seconds():
+                del self._memory[cache_file]
+                return None
+            
+            self._memory.move_to_end(cache_file)
         
-        return age < self.ttl
+        saved_at, payload = entry
+        return saved_at, orjson.loads(payload)
+    
+    def _memory_put(self, cache_file: Path, saved_at: float, value: Any):
+        """Store a cache entry in memory, evicting the least recently used.
+        
+        Args:
+            cache_file: Cache file path the entry belongs to
+            saved_at: When the entry was written, in epoch seconds
+            value: Cached value
+        """
+        # Encode outside the lock; the snapshot is immune to later mutation
+        payload = orjson.dumps(value, default=str)
+        with self._memory_lock:
+            self._memory[cache_file] = (saved_at, payload)
+            self._memory.move_to_end(cache_file)
+            if len(self._memory) > self.MEMORY_CACHE_SIZE:
+                self._memory.popitem(last=False)
     
     def get_search_cache(self, 
                         query: str, 
@@ -66,21 +288,18 @@ class CacheManager:
         Returns:
             Cached results or None
         """
-        cache_data = {
-            "query": query,
-            "keywords": sorted(keywords[:10]),  # Limit and sort for consistency
-            "domains": sorted(domains[:10]),
-            "location": location
-        }
+        _, cache_key, cache_file = self._search_key(query, keywords, domains, location)
         
-        cache_key = self._generate_cache_key(cache_data)
-        cache_file = self.search_cache_dir / f"{cache_key}.pkl"
+        entry = self._memory_get(cache_file)
+        if entry is not None:
+            return entry[1]
         
-        if self._is_cache_valid(cache_file):
+        mtime = self._valid_mtime(cache_file)
+        if mtime is not None:
             try:
-                with open(cache_file, 'rb') as f:
-                    cached = pickle.load(f)
+                cached = orjson.loads(cache_file.read_bytes())
                 print(f"Cache hit for search: {cache_key}")
+                self._memory_put(cache_file, mtime, cached['results'])
                 return cached['results']
             except Exception as e:
                 print(f"Cache read error: {e}")
@@ -95,38 +314,34 @@ class CacheManager:
                          location: str,
                          results: List[Dict[str, Any]]):
         """Save search results to cache."""
-        cache_data = {
-            "query": query,
-            "keywords": sorted(keywords[:10]),
-            "domains": sorted(domains[:10]),
-            "location": location
-        }
-        
-        cache_key = self._generate_cache_key(cache_data)
-        cache_file = self.search_cache_dir / f"{cache_key}.pkl"
+        cache_data, cache_key, cache_file = self._search_key(query, keywords, domains, location)
         
         try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump({
-                    'cache_key': cache_key,
-                    'timestamp': datetime.now(),
-                    'query_params': cache_data,
-                    'results': results
-                }, f)
+            self._write_atomic(cache_file, {
+                'cache_key': cache_key,
+                'timestamp': datetime.now(),
+                'query_params': cache_data,
+                'results': results
+            }, default=str)  # pickle accepted any object; stringify the odd ones
+            self._memory_put(cache_file, time.time(), results)
             print(f"Cached search results: {cache_key}")
         except Exception as e:
             print(f"Cache write error: {e}")
     
     def get_extract_cache(self, url: str) -> Optional[Dict[str, Any]]:
         """Get cached extraction for a URL."""
-        cache_key = self._generate_cache_key({"url": url})
-        cache_file = self.extract_cache_dir / f"{cache_key}.json"
+        cache_file = self._shard_path(self.extract_cache_dir, self._url_key(url))
         
-        if self._is_cache_valid(cache_file):
+        entry = self._memory_get(cache_file)
+        if entry is not None:
+            return entry[1]
+        
+        mtime = self._valid_mtime(cache_file)
+        if mtime is not None:
             try:
-                with open(cache_file, 'r') as f:
-                    cached = json.load(f)
+                cached = orjson.loads(cache_file.read_bytes())
                 print(f"Cache hit for extract: {url[:50]}...")
+                self._memory_put(cache_file, mtime, cached['extracted'])
                 return cached['extracted']
             except Exception as e:
                 print(f"Cache read error: {e}")
@@ -136,16 +351,15 @@ class CacheManager:
     
     def save_extract_cache(self, url: str, extracted: Dict[str, Any]):
         """Save extraction result to cache."""
-        cache_key = self._generate_cache_key({"url": url})
-        cache_file = self.extract_cache_dir / f"{cache_key}.json"
+        cache_file = self._shard_path(self.extract_cache_dir, self._url_key(url))
         
         try:
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    'url': url,
-                    'timestamp': datetime.now().isoformat(),
-                    'extracted': extracted
-                }, f, indent=2)
+            self._write_atomic(cache_file, {
+                'url': url,
+                'timestamp': datetime.now(),
+                'extracted': extracted
+            })
+            self._memory_put(cache_file, time.time(), extracted)
             print(f"Cached extraction for: {url[:50]}...")
         except Exception as e:
             print(f"Cache write error: {e}")
@@ -153,29 +367,27 @@ class CacheManager:
     def get_llm_cache(self, 
                      events: List[Dict[str, Any]], 
                      user_profile: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Get cached LLM scoring results."""
-        # Create cache key from events and profile
-        cache_data = {
-            "events": [
-                {
-                    "title": e.get("title"),
-                    "location": e.get("location"),
-                    "summary": e.get("summary", "")[:100]
-                } 
-                for e in events
-            ],
-            "interests": user_profile.get("interest_areas", []),
-            "keywords": sorted(user_profile.get("keywords", [])[:10])
-        }
+        """Get cached LLM scoring results.
         
-        cache_key = self._generate_cache_key(cache_data)
-        cache_file = self.llm_cache_dir / f"{cache_key}.json"
+        Args:
+            events: Events that were scored
+            user_profile: Profile they were scored against
+            
+        Returns:
+            Cached result or None
+        """
+        _, cache_key, cache_file = self._llm_key(events, user_profile)
         
-        if self._is_cache_valid(cache_file):
+        entry = self._memory_get(cache_file)
+        if entry is not None:
+            return entry[1]
+        
+        mtime = self._valid_mtime(cache_file)
+        if mtime is not None:
             try:
-                with open(cache_file, 'r') as f:
-                    cached = json.load(f)
+                cached = orjson.loads(cache_file.read_bytes())
                 print(f"Cache hit for LLM scoring: {cache_key}")
+                self._memory_put(cache_file, mtime, cached['result'])
                 return cached['result']
             except Exception as e:
                 print(f"Cache read error: {e}")
@@ -188,29 +400,15 @@ class CacheManager:
                       user_profile: Dict[str, Any],
                       result: Dict[str, Any]):
         """Save LLM scoring result to cache."""
-        cache_data = {
-            "events": [
-                {
-                    "title": e.get("title"),
-                    "location": e.get("location"),
-                    "summary": e.get("summary", "")[:100]
-                } 
-                for e in events
-            ],
-            "interests": user_profile.get("interest_areas", []),
-            "keywords": sorted(user_profile.get("keywords", [])[:10])
-        }
-        
-        cache_key = self._generate_cache_key(cache_data)
-        cache_file = self.llm_cache_dir / f"{cache_key}.json"
+        cache_data, cache_key, cache_file = self._llm_key(events, user_profile)
         
         try:
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    'timestamp': datetime.now().isoformat(),
-                    'cache_params': cache_data,
-                    'result': result
-                }, f, indent=2)
+            self._write_atomic(cache_file, {
+                'timestamp': datetime.now(),
+                'cache_params': cache_data,
+                'result': result
+            })
+            self._memory_put(cache_file, time.time(), result)
             print(f"Cached LLM scoring: {cache_key}")
         except Exception as e:
             print(f"Cache write error: {e}")
@@ -218,38 +416,56 @@ class CacheManager:
     def clear_expired_cache(self):
         """Remove expired cache entries."""
         removed_count = 0
+        cutoff = time.time() - self.ttl.total_seconds()
         
         for cache_dir in [self.search_cache_dir, self.extract_cache_dir, self.llm_cache_dir]:
-            for cache_file in cache_dir.glob("*"):
-                if not self._is_cache_valid(cache_file):
-                    try:
-                        cache_file.unlink()
+            # DirEntry.stat() reuses the scandir result where the OS provides it
+            for entry in self._iter_cache_files(cache_dir):
+                try:
+                    if entry.stat().st_mtime <= cutoff:
+                        os.unlink(entry.path)
                         removed_count += 1
-                    except Exception as e:
-                        print(f"Error removing cache file {cache_file}: {e}")
+                except OSError as e:
+                    print(f"Error removing cache file {entry.path}: {e}")
         
         if removed_count > 0:
             print(f"Removed {removed_count} expired cache entries")
+            self._stats_cache = None
         
         return removed_count
     
     def get_cache_stats(self) -> Dict[str, Any]:
-        """Get statistics about cache usage."""
+        """Get statistics about cache usage (rescanned at most every STATS_TTL_SECONDS)."""
+        cached = self._stats_cache
+        if cached and time.time() - cached[0] < self.STATS_TTL_SECONDS:
+            return dict(cached[1])
+        
         stats = {
-            "search_entries": len(list(self.search_cache_dir.glob("*.pkl"))),
-            "extract_entries": len(list(self.extract_cache_dir.glob("*.json"))),
-            "llm_entries": len(list(self.llm_cache_dir.glob("*.json"))),
+            "search_entries": 0,
+            "extract_entries": 0,
+            "llm_entries": 0,
             "total_size_mb": 0
         }
+        total_bytes = 0
         
-        # Calculate total cache size
-        for cache_dir in [self.search_cache_dir, self.extract_cache_dir, self.llm_cache_dir]:
-            for file in cache_dir.glob("*"):
-                stats["total_size_mb"] += file.stat().st_size / (1024 * 1024)
+        # One scandir walk per directory tree counts entries and sizes together
+        for count_key, cache_dir in [("search_entries", self.search_cache_dir),
+                                     ("extract_entries", self.extract_cache_dir),
+                                     ("llm_entries", self.llm_cache_dir)]:
+            for entry in self._iter_cache_files(cache_dir):
+                # Files can be cleaned up or replaced between scandir and stat
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                if entry.name.endswith(".json"):
+                    stats[count_key] += 1
+                total_bytes += size
         
-        stats["total_size_mb"] = round(stats["total_size_mb"], 2)
+        stats["total_size_mb"] = round(total_bytes / (1024 * 1024), 2)
         
-        return stats
+        self._stats_cache = (time.time(), stats)
+        return dict(stats)
 
 
 def test_cache_manager():
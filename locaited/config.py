@@ -43,13 +43,16 @@ TOP_EVENTS_FOR_GATE = 10  # Number of top events to show in gate decision
 
 # Agent Configuration
 RESEARCHER_LEADS_COUNT = 25
+RESEARCHER_MAX_CONCURRENT_LLM_CALLS = 4  # Parallel verification/expansion batches
 FACT_CHECKER_BATCH_SIZE = 25  # Process all leads
+FACT_CHECKER_MAX_CONCURRENT_SEARCHES = 5  # Parallel Tavily searches per batch
 PUBLISHER_DEDUP_THRESHOLD = 0.8  # Similarity threshold for deduplication
 
 # Cache Configuration
 CACHE_ENABLED = True
 CACHE_TTL_SECONDS = 3600  # 1 hour
 CACHE_MAX_SIZE_MB = 100  # Maximum cache size
+CACHE_CLEANUP_INTERVAL_SECONDS = 900  # API removes expired cache files every 15 minutes
 
 # Query Defaults
 DEFAULT_LOCATION = "New York City"
@@ -4,11 +4,11 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 import json
 import hashlib
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON
+from sqlalchemy import create_engine, select, Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship, Session
 from sqlalchemy.sql import func
 
-from config import DATABASE_URL
+from locaited.config import DATABASE_URL
 
 Base = declarative_base()
 
@@ -106,6 +106,10 @@ class QueryCache(Base):
         data = json.dumps({"query": query, "filters": filters, "model": model}, sort_keys=True)
         return hashlib.sha256(data.encode()).hexdigest()
 
+# Statements reused across requests; limit() binds as a parameter, so every
+# call hits the same entry in the compiled-statement cache
+RECENT_EVENTS_STMT = select(Event).order_by(Event.created_at.desc())
+
 # Database setup
 engine = create_engine(DATABASE_URL, echo=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
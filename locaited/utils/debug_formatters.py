@@ -0,0 +1,256 @@
+"""Format agent state for the debug UI's step-by-step agent output panels."""
+
+from typing import Dict, Any
+
+
+def format_editor_output(state: Dict[str, Any], verbose: bool = False) -> Dict[str, Any]:
+    """Format Editor results.
+    
+    Args:
+        state: Workflow state after the Editor ran
+        verbose: Include the agent's full output and metrics under raw_data
+    
+    Returns:
+        Profile summary and researcher guidance for display
+    """
+    profile = state.get("profile", {})
+    metrics = state.get("editor_metrics", {})
+    cost = metrics.get("llm_cost", 0)
+    elapsed = metrics.get("elapsed_time", 0)
+    tokens = metrics.get("llm_tokens", 0)
+    
+    output = {
+        "summary": f"Profile created for iteration {profile.get('iteration', 1)}",
+        "profile": {
+            "location": profile.get("location"),
+            "timeframe": profile.get("time_frame"),
+            "interests": profile.get("interests", [])
+        },
+        "guidance": profile.get("researcher_guidance", ""),
+        "metrics": {
+            "cost": f"${cost:.4f}",
+            "time": f"{elapsed:.2f}s",
+            "tokens": tokens
+        }
+    }
+    
+    if verbose:
+        output["raw_data"] = {
+            "profile": profile,
+            "metrics": metrics
+        }
+    
+    return output
+
+
+def format_researcher_output(state: Dict[str, Any], verbose: bool = False) -> Dict[str, Any]:
+    """Format Researcher results.
+    
+    Args:
+        state: Workflow state after the Researcher ran
+        verbose: Include the agent's full output and metrics under raw_data
+    
+    Returns:
+        Lead counts and a preview of the first leads for display
+    """
+    leads = state.get("leads", [])
+    metrics = state.get("researcher_metrics", {})
+    cost = metrics.get("llm_cost", 0)
+    elapsed = metrics.get("elapsed_time", 0)
+    tokens = metrics.get("llm_tokens", 0)
+    
+    # Lead lists are small; a plain dict tally avoids building a Counter
+    lead_types = {}
+    for lead in leads:
+        lead_type = lead.get("type", "unknown")
+        lead_types[lead_type] = lead_types.get(lead_type, 0) + 1
+    
+    preview = [
+        {
+            "number": i,
+            "description": lead.get("description", ""),
+            "type": lead.get("type", "unknown"),
+            "keywords": lead.get("keywords", []),
+            "date": lead.get("date", "No date"),
+            "time": lead.get("time"),
+            "venue": lead.get("venue"),
+            "source_url": lead.get("source_url")
+        }
+        for i, lead in enumerate(leads[:5], 1)
+    ]
+    
+    output = {
+        "summary": f"Generated {len(leads)} event leads",
+        "total_leads": len(leads),
+        "lead_types": lead_types,
+        "preview": preview,
+        "show_all": len(leads) > 5,
+        "metrics": {
+            "cost": f"${cost:.4f}",
+            "time": f"{elapsed:.2f}s",
+            "tokens": tokens
+        }
+    }
+    
+    if verbose:
+        output["raw_data"] = {
+            "leads": leads,
+            "metrics": metrics
+        }
+    
+    return output
+
+
+def format_fact_checker_output(state: Dict[str, Any], verbose: bool = False) -> Dict[str, Any]:
+    """Format Fact-Checker results.
+    
+    Args:
+        state: Workflow state after the Fact-Checker ran
+        verbose: Include the agent's full output and metrics under raw_data
+    
+    Returns:
+        Search counts and per-lead search details for display
+    """
+    evidence = state.get("evidence", [])
+    metrics = state.get("fact_checker_metrics", {})
+    cost = metrics.get("tavily_cost", 0)
+    elapsed = metrics.get("elapsed_time", 0)
+    
+    # Counts accumulate in the same pass that builds the per-search details
+    search_details = []
+    append = search_details.append
+    searches_with_results = 0
+    total_results = 0
+    for item in evidence:
+        results = item.get("results", [])
+        results_found = len(results)
+        if results_found:
+            searches_with_results += 1
+            total_results += results_found
+        
+        if "error" in item:
+            status = "Error"
+        elif results_found:
+            status = "Found"
+        else:
+            status = "No results"
+        
+        lead = item.get("lead", {})
+        lead_desc = lead.get("description", "Unknown lead") if isinstance(lead, dict) else str(lead)
+        append({
+            "description": lead_desc,
+            "status": status,
+            "results_found": results_found,
+            "top_sources": [r.get("domain") or r.get("url", "") for r in results[:3]]
+        })
+    
+    output = {
+        "summary": f"Found evidence for {searches_with_results} of {len(evidence)} leads",
+        "total_searches": len(evidence),
+        "searches_with_results": searches_with_results,
+        "total_results": total_results,
+        "search_details": search_details,
+        "metrics": {
+            "cost": f"${cost:.4f}",
+            "time": f"{elapsed:.2f}s",
+            "tokens": 0
+        }
+    }
+    
+    if verbose:
+        output["raw_data"] = {
+            "evidence": evidence,
+            "metrics": metrics
+        }
+    
+    return output
+
+
+def format_publisher_output(state: Dict[str, Any], verbose: bool = False) -> Dict[str, Any]:
+    """Format Publisher results.
+    
+    Args:
+        state: Workflow state after the Publisher ran
+        verbose: Include the agent's full output and metrics under raw_data
+    
+    Returns:
+        Gate decision, quality counts and an event preview for display
+    """
+    events = state.get("events", [])
+    metrics = state.get("publisher_metrics", {})
+    cost = metrics.get("llm_cost", 0)
+    elapsed = metrics.get("elapsed_time", 0)
+    tokens = metrics.get("llm_tokens", 0)
+    gate_decision = state.get("gate_decision", "UNKNOWN")
+    
+    # One pass counts field coverage and builds the preview together
+    events_with_time = events_with_desc = events_with_url = 0
+    events_preview = []
+    for i, event in enumerate(events):
+        has_time = bool(event.get("time"))
+        has_description = bool(event.get("description"))
+        has_url = bool(event.get("url"))
+        events_with_time += has_time
+        events_with_desc += has_description
+        events_with_url += has_url
+        
+        if i < 5:
+            events_preview.append({
+                "title": event.get("title", "Untitled Event"),
+                "date": event.get("date"),
+                "time": event.get("time"),
+                "location": event.get("location"),
+                "score": event.get("score", 0),
+                "has_url": has_url,
+                "has_description": has_description
+            })
+    
+    if gate_decision == "APPROVE":
+        summary = f"Approved {len(events)} events"
+    else:
+        summary = f"Gate decision: {gate_decision}"
+    
+    output = {
+        "summary": summary,
+        "total_events": len(events),
+        "gate_decision": gate_decision,
+        "feedback": state.get("feedback"),
+        "quality_metrics": {
+            "with_time": events_with_time,
+            "with_description": events_with_desc,
+            "with_url": events_with_url
+        },
+        "events_preview": events_preview,
+        "show_all_events": len(events) > 5,
+        "metrics": {
+            "cost": f"${cost:.4f}",
+            "time": f"{elapsed:.2f}s",
+            "tokens": tokens
+        }
+    }
+    
+    if verbose:
+        output["raw_data"] = {
+            "events": events,
+            "metrics": metrics
+        }
+    
+    return output
+
+
+def format_error_output(agent: str, error: Exception) -> Dict[str, Any]:
+    """Format an agent failure.
+    
+    Args:
+        agent: Agent that failed
+        error: Raised exception
+    
+    Returns:
+        Error summary for display
+    """
+    return {
+        "summary": f"{agent} failed: {error}",
+        "agent": agent,
+        "error": str(error),
+        "error_type": type(error).__name__
+    }
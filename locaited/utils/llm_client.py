@@ -6,7 +6,10 @@ from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 from openai import OpenAI
 from openai.types.chat import ChatCompletion
 
@@ -50,6 +53,9 @@ class LLMClient:
         # Error tracking
         self.errors = []
         
+        # Completions may run from worker threads
+        self._metrics_lock = threading.Lock()
+        
         logger.info(f"LLMClient initialized with model: {model}")
     
     def complete(
@@ -118,10 +124,11 @@ class LLMClient:
                 cost = self._calculate_cost(input_tokens, output_tokens)
                 
                 # Update tracking
-                self.total_input_tokens += input_tokens
-                self.total_output_tokens += output_tokens
-                self.total_cost += cost
-                self.request_count += 1
+                with self._metrics_lock:
+                    self.total_input_tokens += input_tokens
+                    self.total_output_tokens += output_tokens
+                    self.total_cost += cost
+                    self.request_count += 1
                 
                 logger.info(
                     f"LLM completion: {total_tokens} tokens, "
@@ -140,11 +147,12 @@ class LLMClient:
                 
             except Exception as e:
                 last_error = e
-                self.errors.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "error": str(e),
-                    "attempt": attempt + 1
-                })
+                with self._metrics_lock:
+                    self.errors.append({
+                        "timestamp": datetime.now().isoformat(),
+                        "error": str(e),
+                        "attempt": attempt + 1
+                    })
                 
                 if attempt < retry_count - 1:
                     wait_time = 2 ** attempt  # Exponential backoff
@@ -197,8 +205,8 @@ class LLMClient:
                 content = content[:-3]  # Remove trailing ```
             content = content.strip()
             
-            # Parse JSON response
-            json_content = json.loads(content)
+            # Parse JSON response (orjson errors subclass json.JSONDecodeError)
+            json_content = orjson.loads(content)
             
             # Validate against schema if provided
             if schema:
@@ -270,39 +278,45 @@ class LLMClient:
     def batch_complete(
         self,
         requests: List[Dict[str, str]],
+        max_workers: int = 4,
         **kwargs
     ) -> List[Dict[str, Any]]:
-        """Process multiple completion requests.
+        """Process multiple completion requests concurrently.
         
         Args:
             requests: List of dicts with 'system' and 'user' prompts
+            max_workers: Maximum number of requests in flight at once
             **kwargs: Additional arguments for complete()
             
         Returns:
-            List of responses
+            List of responses, in the same order as requests
         """
-        results = []
+        if not requests:
+            return []
         
-        for i, request in enumerate(requests):
+        def run(i: int, request: Dict[str, str]) -> Dict[str, Any]:
             logger.info(f"Processing batch request {i+1}/{len(requests)}")
             
             try:
-                result = self.complete(
+                return self.complete(
                     system_prompt=request.get("system", ""),
                     user_prompt=request["user"],
                     **kwargs
                 )
-                results.append(result)
                 
             except Exception as e:
                 logger.error(f"Batch request {i+1} failed: {e}")
-                results.append({
+                return {
                     "error": str(e),
                     "content": None,
                     "cost": 0
-                })
+                }
         
-        return results
+        # Requests are independent network round trips; metrics updates in
+        # complete() are guarded by _metrics_lock
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as executor:
+            futures = [executor.submit(run, i, request) for i, request in enumerate(requests)]
+            return [future.result() for future in futures]
     
     def __str__(self) -> str:
         """String representation."""
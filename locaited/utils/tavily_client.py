@@ -3,21 +3,47 @@
 import os
 import logging
 from typing import Dict, Any, List, Optional
+from pathlib import Path
+from collections import OrderedDict, deque
 from datetime import datetime
 import time
+import threading
 import hashlib
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import orjson
 from tavily import TavilyClient as TavilyAPI
 
 logger = logging.getLogger(__name__)
 
+# xxhash is optional: cache keys fall back to an 8-byte BLAKE2b digest
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 
 class TavilyClient:
     """Client for Tavily search API with enhanced features."""
     
     # Cost per search (as of 2025)
     SEARCH_COST = 0.001  # $1 per 1000 searches
+    SEARCH_COST_STR = f"${SEARCH_COST:.4f}"
+    
+    # Tavily returns empty results for longer domain filter lists
+    MAX_DOMAINS = 20
+    
+    # Cached results expire after an hour
+    CACHE_TTL_SECONDS = 3600
+    
+    # Entries kept in the in-process LRU in front of the disk cache
+    MEMORY_CACHE_SIZE = 512
+    
+    # Recent errors retained for metrics; older ones are dropped
+    MAX_ERRORS = 100
+    
+    # Cache files kept on disk; the least recently used are evicted past this
+    MAX_CACHE_ENTRIES = 10000
     
     def __init__(self, use_cache: bool = True):
         """Initialize Tavily client.
@@ -38,7 +64,29 @@ class TavilyClient:
         
         # Performance tracking
         self.total_time = 0.0
-        self.errors = []
+        self.errors: deque = deque(maxlen=self.MAX_ERRORS)
+        
+        # Searches may run from worker threads
+        self._metrics_lock = threading.Lock()
+        
+        # cache_key -> (saved_at epoch seconds, orjson-encoded results);
+        # consulted before the JSON files. Hits decode a fresh copy, so
+        # callers can't mutate each other's results.
+        self._memory_cache = OrderedDict()
+        self._memory_lock = threading.Lock()
+        
+        # Cache files are written in the background, in submission order;
+        # interpreter exit waits for queued writes
+        self._cache_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tavily-cache")
+        
+        # Approximate cache file count, only touched by the writer thread;
+        # None until the first write scans the directory
+        self._disk_entries: Optional[int] = None
+        
+        # cache_key -> future for a search currently calling the API; it
+        # resolves to the orjson-encoded results
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
         
         # Cache setup
         if self.use_cache:
@@ -53,21 +101,42 @@ class TavilyClient:
         self.cache_dir = PROJECT_ROOT / "cache" / "v0.4.0" / "tavily"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
     
-    def _get_cache_key(self, query: str, **kwargs) -> str:
+    def _get_cache_key(
+        self,
+        query: str,
+        search_depth: str,
+        max_results: int,
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+        include_answer: bool = False,
+        include_raw_content: bool = False
+    ) -> str:
         """Generate cache key from search parameters.
         
         Args:
             query: Search query
-            **kwargs: Additional search parameters
+            search_depth: "basic" or "advanced"
+            max_results: Maximum number of results
+            include_domains: Domains searched
+            exclude_domains: Domains excluded
+            include_answer: Whether the answer was requested
+            include_raw_content: Whether raw page content was requested
             
         Returns:
-            MD5 hash as cache key
+            xxh3 hash (BLAKE2b without xxhash) as cache key
         """
-        # Create stable string from parameters
-        params = {"query": query, **kwargs}
-        params_str = json.dumps(params, sort_keys=True)
+        # Unit-separator joined fields; domain order doesn't change results
+        key = (
+            f"{query}\x1f{search_depth}\x1f{max_results}"
+            f"\x1f{'|'.join(sorted(include_domains or ()))}"
+            f"\x1f{'|'.join(sorted(exclude_domains or ()))}"
+            f"\x1f{int(include_answer)}{int(include_raw_content)}"
+        )
         
-        return hashlib.md5(params_str.encode()).hexdigest()
+        # Keys never leave this cache, so a fast non-cryptographic hash will do
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(key.encode())
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
     
     def _get_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Retrieve cached search results.
@@ -81,25 +150,49 @@ class TavilyClient:
         if not self.use_cache:
             return None
         
+        with self._memory_lock:
+            entry = self._memory_cache.get(cache_key)
+            if entry is not None:
+                cached_at, payload = entry
+                if time.time() - cached_at < self.CACHE_TTL_SECONDS:
+                    self._memory_cache.move_to_end(cache_key)
+                else:
+                    del self._memory_cache[cache_key]
+                    entry = None
+        
+        if entry is not None:
+            return orjson.loads(payload)
+        
         cache_file = self.cache_dir / f"{cache_key}.json"
         
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Check cache age (1 hour TTL)
-                cached_time = datetime.fromisoformat(data['timestamp'])
-                age = (datetime.now() - cached_time).total_seconds()
+        # Open directly: a separate exists() check costs a stat and can race
+        # with clear_cache removing the file
+        try:
+            with open(cache_file, 'rb') as f:
+                data = orjson.loads(f.read())
+            
+            # Check cache age (1 hour TTL); older entries stored an ISO string
+            cached_at = data.get('ts')
+            if cached_at is None:
+                cached_at = datetime.fromisoformat(data['timestamp']).timestamp()
+            age = time.time() - cached_at
+            
+            if age < self.CACHE_TTL_SECONDS:
+                logger.info(f"Cache hit for search (age: {age:.0f}s)")
+                self._remember(cache_key, cached_at, orjson.dumps(data['results']))
+                # Eviction ranks files by mtime; mark this one recently used
+                try:
+                    os.utime(cache_file)
+                except OSError:
+                    pass
+                return data['results']
+            else:
+                logger.info(f"Cache expired for search (age: {age:.0f}s)")
                 
-                if age < 3600:  # 1 hour
-                    logger.info(f"Cache hit for search (age: {age:.0f}s)")
-                    return data['results']
-                else:
-                    logger.info(f"Cache expired for search (age: {age:.0f}s)")
-                    
-            except Exception as e:
-                logger.error(f"Error reading cache: {e}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error reading cache: {e}")
         
         return None
     
@@ -115,19 +208,97 @@ class TavilyClient:
         
         cache_file = self.cache_dir / f"{cache_key}.json"
         
+        # Encode on the caller's thread: the memory tier and the background
+        # writer then hold a snapshot the caller can't mutate afterwards
         try:
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'results': results
-            }
-            
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            payload = orjson.dumps(results)
+        except TypeError as e:
+            logger.error(f"Error saving to cache: {e}")
+            return
+        
+        # The memory tier serves this process immediately; the file write
+        # happens off the search path
+        now = time.time()
+        self._remember(cache_key, now, payload)
+        self._cache_pool.submit(self._write_cache_file, cache_file, now, payload)
+    
+    def _write_cache_file(self, cache_file: Path, cached_at: float, payload: bytes):
+        """Write a cache file atomically so readers never see a partial entry.
+        
+        Args:
+            cache_file: Destination cache file
+            cached_at: When the results were cached, in epoch seconds
+            payload: orjson-encoded search results
+        """
+        tmp_file = cache_file.with_name(f"{cache_file.name}.tmp{os.getpid()}-{threading.get_ident()}")
+        
+        try:
+            # Compact orjson output; results carry long content strings
+            with open(tmp_file, 'wb') as f:
+                f.write(b'{"ts":' + orjson.dumps(cached_at) + b',"results":' + payload + b'}')
+            os.replace(tmp_file, cache_file)
                 
             logger.info(f"Saved search results to cache")
             
         except Exception as e:
+            tmp_file.unlink(missing_ok=True)
             logger.error(f"Error saving to cache: {e}")
+            return
+        
+        # Overwrites also count, so this overestimates; eviction rescans
+        if self._disk_entries is None:
+            self._disk_entries = self.MAX_CACHE_ENTRIES + 1
+        else:
+            self._disk_entries += 1
+        
+        if self._disk_entries > self.MAX_CACHE_ENTRIES:
+            self._evict_cache_files()
+    
+    def _evict_cache_files(self):
+        """Delete least recently used cache files once over MAX_CACHE_ENTRIES.
+        
+        Runs on the cache writer thread. Files are ranked by mtime, which
+        writes and disk hits refresh, and pruned to 90% of the cap so a full
+        cache isn't rescanned on every write.
+        """
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                files = [(entry.stat().st_mtime, entry.path)
+                         for entry in entries if entry.name.endswith(".json")]
+        except OSError as e:
+            logger.error(f"Error scanning cache: {e}")
+            return
+        
+        self._disk_entries = len(files)
+        if len(files) <= self.MAX_CACHE_ENTRIES:
+            return
+        
+        files.sort()
+        excess = len(files) - int(self.MAX_CACHE_ENTRIES * 0.9)
+        removed = 0
+        for _, path in files[:excess]:
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+        
+        self._disk_entries -= removed
+        logger.info(f"Evicted {removed} least recently used cache files")
+    
+    def _remember(self, cache_key: str, cached_at: float, payload: bytes):
+        """Store an entry in the in-process LRU, evicting the oldest if full.
+        
+        Args:
+            cache_key: Cache key
+            cached_at: When the results were cached, in epoch seconds
+            payload: orjson-encoded search results
+        """
+        with self._memory_lock:
+            self._memory_cache[cache_key] = (cached_at, payload)
+            self._memory_cache.move_to_end(cache_key)
+            if len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
     
     def search(
         self,
@@ -155,13 +326,23 @@ class TavilyClient:
         Returns:
             Dictionary with search results and metadata
         """
+        # Oversized domain filters come back empty but still cost a credit
+        if include_domains and len(include_domains) > self.MAX_DOMAINS:
+            logger.warning(f"Truncating include_domains from {len(include_domains)} to {self.MAX_DOMAINS}")
+            include_domains = include_domains[:self.MAX_DOMAINS]
+        if exclude_domains and len(exclude_domains) > self.MAX_DOMAINS:
+            logger.warning(f"Truncating exclude_domains from {len(exclude_domains)} to {self.MAX_DOMAINS}")
+            exclude_domains = exclude_domains[:self.MAX_DOMAINS]
+        
         # Check cache first
         cache_key = self._get_cache_key(
             query=query,
             search_depth=search_depth,
             max_results=max_results,
             include_domains=include_domains,
-            exclude_domains=exclude_domains
+            exclude_domains=exclude_domains,
+            include_answer=include_answer,
+            include_raw_content=include_raw_content
         )
         
         cached_results = self._get_from_cache(cache_key)
@@ -169,6 +350,76 @@ class TavilyClient:
             # Don't count cost for cached results
             return cached_results
         
+        # Identical searches already in flight share that call's result
+        # instead of paying for their own
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[cache_key] = future
+        
+        if not owner:
+            logger.info(f"Joining in-flight search for: {query}")
+            # The future holds encoded results; each waiter decodes its own copy
+            return orjson.loads(future.result())
+        
+        try:
+            results = self._search_uncached(
+                cache_key=cache_key,
+                query=query,
+                search_depth=search_depth,
+                max_results=max_results,
+                include_domains=include_domains,
+                exclude_domains=exclude_domains,
+                include_answer=include_answer,
+                include_raw_content=include_raw_content,
+                retry_count=retry_count
+            )
+        except BaseException as e:
+            # Waiters must not block forever, whatever stopped this call
+            future.set_exception(e)
+            raise
+        else:
+            # Encoded before the owner returns, so its caller's later
+            # mutations can't reach the waiters
+            try:
+                future.set_result(orjson.dumps(results))
+            except TypeError as e:
+                future.set_exception(e)
+            return results
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+    
+    def _search_uncached(
+        self,
+        cache_key: str,
+        query: str,
+        search_depth: str,
+        max_results: int,
+        include_domains: Optional[List[str]],
+        exclude_domains: Optional[List[str]],
+        include_answer: bool,
+        include_raw_content: bool,
+        retry_count: int
+    ) -> Dict[str, Any]:
+        """Call the Tavily API with retries and cache the results.
+        
+        Args:
+            cache_key: Cache key for these search parameters
+            query: Search query
+            search_depth: "basic" or "advanced"
+            max_results: Maximum number of results
+            include_domains: List of domains to search
+            exclude_domains: List of domains to exclude
+            include_answer: Include AI-generated answer
+            include_raw_content: Include raw page content
+            retry_count: Number of retries on failure
+            
+        Returns:
+            Dictionary with search results and metadata
+        """
         # Build search parameters
         params = {
             "query": query,
@@ -196,31 +447,37 @@ class TavilyClient:
                 elapsed = time.time() - start_time
                 
                 # Track metrics
-                self.total_searches += 1
-                self.total_cost += self.SEARCH_COST
-                self.total_time += elapsed
+                with self._metrics_lock:
+                    self.total_searches += 1
+                    self.total_cost += self.SEARCH_COST
+                    self.total_time += elapsed
                 
                 # Process results
                 results = self._process_results(raw_results, query, elapsed)
                 
+                # A domain filter with no matches falls back below
+                if not results["results"] and include_domains:
+                    break
+                
                 # Cache results
                 self._save_to_cache(cache_key, results)
                 
                 logger.info(
                     f"Tavily search completed: {len(results['results'])} results, "
-                    f"${self.SEARCH_COST:.4f} cost, {elapsed:.2f}s"
+                    f"{self.SEARCH_COST_STR} cost, {elapsed:.2f}s"
                 )
                 
                 return results
                 
             except Exception as e:
                 last_error = e
-                self.errors.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "error": str(e),
-                    "query": query,
-                    "attempt": attempt + 1
-                })
+                with self._metrics_lock:
+                    self.errors.append({
+                        "timestamp": datetime.now().isoformat(),
+                        "error": str(e),
+                        "query": query,
+                        "attempt": attempt + 1
+                    })
                 
                 if attempt < retry_count - 1:
                     wait_time = 2 ** attempt  # Exponential backoff
@@ -231,9 +488,24 @@ class TavilyClient:
                     time.sleep(wait_time)
                 else:
                     logger.error(f"Tavily search failed after {retry_count} attempts: {e}")
-        
-        # All retries failed
-        raise Exception(f"Tavily search failed after {retry_count} attempts: {last_error}")
+        else:
+            # All retries failed
+            raise Exception(f"Tavily search failed after {retry_count} attempts: {last_error}")
+        
+        # Nothing matched the domain filter: retry once unrestricted and
+        # remember the fallback under the filtered key too
+        logger.info("No results within include_domains, retrying without domain filter")
+        results = self.search(
+            query=query,
+            search_depth=search_depth,
+            max_results=max_results,
+            exclude_domains=exclude_domains,
+            include_answer=include_answer,
+            include_raw_content=include_raw_content,
+            retry_count=retry_count
+        )
+        self._save_to_cache(cache_key, results)
+        return results
     
     def _process_results(
         self, 
@@ -252,22 +524,27 @@ class TavilyClient:
             Processed results
         """
         results = []
+        # Bound once; this loop runs for every result of every search
+        extract_domain = self._extract_domain
+        append = results.append
         
-        for item in raw_results.get("results", []):
+        for item in raw_results.get("results", ()):
+            get = item.get
+            url = get("url")
             result = {
-                "url": item.get("url"),
-                "title": item.get("title"),
-                "content": item.get("content"),
-                "score": item.get("score", 0),
-                "published_date": item.get("published_date"),
-                "domain": self._extract_domain(item.get("url", ""))
+                "url": url,
+                "title": get("title"),
+                "content": get("content"),
+                "score": get("score", 0),
+                "published_date": get("published_date"),
+                "domain": extract_domain(url if url is not None else "")
             }
             
             # Add raw content if available
             if "raw_content" in item:
                 result["raw_content"] = item["raw_content"]
             
-            results.append(result)
+            append(result)
         
         return {
             "query": query,
@@ -288,51 +565,60 @@ class TavilyClient:
         Returns:
             Domain name
         """
-        from urllib.parse import urlparse
-        
+        # Tavily URLs are plain scheme://host/path; slicing out the host
+        # avoids a full urlparse per result
         try:
-            parsed = urlparse(url)
-            return parsed.netloc
-        except:
+            start = url.find("://")
+            rest = url[start + 3:] if start != -1 else url
+            end = len(rest)
+            for sep in "/?#":
+                i = rest.find(sep)
+                if i != -1 and i < end:
+                    end = i
+            host = rest[:end]
+            return host[host.rfind("@") + 1:]
+        except Exception:
             return ""
     
     def batch_search(
         self,
         queries: List[str],
+        max_workers: int = 5,
         **kwargs
     ) -> List[Dict[str, Any]]:
-        """Perform multiple searches.
+        """Perform multiple searches concurrently.
         
         Args:
             queries: List of search queries
+            max_workers: Maximum number of searches in flight at once
             **kwargs: Additional search parameters
             
         Returns:
-            List of search results
+            List of search results, in the same order as queries
         """
-        results = []
+        if not queries:
+            return []
         
-        for i, query in enumerate(queries):
+        def run(i: int, query: str) -> Dict[str, Any]:
             logger.info(f"Processing batch search {i+1}/{len(queries)}: {query}")
             
             try:
-                result = self.search(query, **kwargs)
-                results.append(result)
+                return self.search(query, **kwargs)
                 
-                # Small delay to avoid rate limiting
-                if i < len(queries) - 1:
-                    time.sleep(0.5)
-                    
             except Exception as e:
                 logger.error(f"Batch search {i+1} failed: {e}")
-                results.append({
+                return {
                     "query": query,
                     "error": str(e),
                     "results": [],
                     "cost": 0
-                })
+                }
         
-        return results
+        # Rate-limited calls fail and go through search()'s exponential
+        # backoff, so no fixed delay between queries
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            futures = [executor.submit(run, i, query) for i, query in enumerate(queries)]
+            return [future.result() for future in futures]
     
     def search_event_evidence(
         self,
@@ -382,7 +668,7 @@ class TavilyClient:
                 if self.total_searches > 0 else 0
             ),
             "error_count": len(self.errors),
-            "recent_errors": self.errors[-5:] if self.errors else [],
+            "recent_errors": list(self.errors)[-5:],
             "cache_enabled": self.use_cache
         }
     
@@ -391,7 +677,7 @@ class TavilyClient:
         self.total_searches = 0
         self.total_cost = 0.0
         self.total_time = 0.0
-        self.errors = []
+        self.errors.clear()
         logger.info("TavilyClient metrics reset")
     
     def clear_cache(self):
@@ -401,7 +687,12 @@ class TavilyClient:
         
         try:
             import shutil
+            # Let queued writes land before removing the directory under them
+            self._cache_pool.submit(lambda: None).result()
             shutil.rmtree(self.cache_dir)
+            self._disk_entries = None
+            with self._memory_lock:
+                self._memory_cache.clear()
             self._init_cache()
             logger.info("Tavily cache cleared")
         except Exception as e:
@@ -422,6 +713,7 @@ class TavilyClient:
 
 # Singleton instance for shared use
 _default_client = None
+_default_client_lock = threading.Lock()
 
 def get_tavily_client(use_cache: bool = True) -> TavilyClient:
     """Get or create default Tavily client.
@@ -434,7 +726,10 @@ def get_tavily_client(use_cache: bool = True) -> TavilyClient:
     """
     global _default_client
     
+    # Agents fetch the client from worker threads; build it only once
     if _default_client is None:
-        _default_client = TavilyClient(use_cache=use_cache)
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = TavilyClient(use_cache=use_cache)
     
     return _default_client
\ No newline at end of file
@@ -5,7 +5,7 @@ import json
 import pandas as pd
 from datetime import datetime
 from typing import Dict, Any, List
-from src.agents.workflow import Workflow
+from locaited.agents.workflow import Workflow
 
 logging.basicConfig(
     level=logging.WARNING,  # Reduce noise
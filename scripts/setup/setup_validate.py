@@ -11,9 +11,9 @@ def validate_setup():
     # 1. Test imports
     print("Testing imports...")
     try:
-        from src.agents.workflow_v4 import WorkflowV4
-        from src.utils.llm_client import get_llm_client
-        from src.utils.tavily_client import TavilyClient
+        from locaited.agents.workflow import Workflow
+        from locaited.utils.llm_client import get_llm_client
+        from locaited.utils.tavily_client import TavilyClient
         print("✅ All imports successful")
     except ImportError as e:
         errors.append(f"Import failed: {e}")
@@ -7,10 +7,7 @@ from datetime import datetime
 import json
 import os
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent))
-
-from src.agents.workflow import Workflow
+from locaited.agents.workflow import Workflow
 
 # Setup logging
 logging.basicConfig(
@@ -208,6 +205,11 @@ def save_test_results(results):
 
 def main():
     """Run all tests."""
+    missing = [key for key in ("OPENAI_API_KEY", "TAVILY_API_KEY") if not os.environ.get(key)]
+    if missing:
+        print(f"Skipping workflow validation: {', '.join(missing)} not set")
+        sys.exit(0)
+    
     print("\n" + "="*60)
     print("TESTING WORKFLOW v0.4.0 WITH GROUND TRUTH")
     print("="*60)
@@ -17,7 +17,7 @@ import logging
 import os
 from datetime import datetime
 from typing import Dict, Any, List, Tuple
-from src.agents.workflow import Workflow
+from locaited.agents.workflow import Workflow
 
 # Reduce logging noise
 logging.basicConfig(level=logging.WARNING)
@@ -33,6 +33,8 @@ setup(
         "python-dotenv>=1.0.0",
         "httpx>=0.24.0",
         "sqlalchemy>=2.0.0",
+        "orjson>=3.9.0",
+        "xxhash>=3.0.0",
     ],
     extras_require={
         "dev": [
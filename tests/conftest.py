@@ -78,6 +78,20 @@ def test_cache_dir():
     shutil.rmtree(cache_dir, ignore_errors=True)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolated_project_root(test_cache_dir):
+    """Point PROJECT_ROOT at the test cache directory for the whole session.
+    
+    Agents, the Tavily client and the cache manager derive their cache and
+    debug directories from PROJECT_ROOT, so test runs never write into the
+    repository's cache/ tree.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("locaited.config.PROJECT_ROOT", test_cache_dir)
+        mp.setattr("locaited.cache_manager.PROJECT_ROOT", test_cache_dir)
+        yield test_cache_dir
+
+
 @pytest.fixture(scope="session")
 def shared_cache_config(test_cache_dir):
     """Configuration for shared test cache."""
@@ -2,11 +2,6 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from locaited.agents.editor import EditorAgent
 from locaited.agents.researcher import ResearcherAgent
@@ -2,13 +2,8 @@
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call
-import sys
-from pathlib import Path
 from datetime import datetime
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 from locaited.agents.fact_checker import FactCheckerAgent
 
 
@@ -278,4 +273,82 @@ class TestFactCheckerAgentGathersEvidence:
         metrics = result["fact_checker_metrics"]
         assert metrics["total_leads"] == 25
         assert metrics["tavily_cost"] == 0.025
-        assert metrics["leads_with_evidence"] == 25  # All found evidence
\ No newline at end of file
+        assert metrics["leads_with_evidence"] == 25  # All found evidence
+    
+    @pytest.mark.unit
+    def test_fact_checker_keeps_lead_order_with_concurrent_searches(self, fact_checker_agent):
+        """Test that concurrent searches return evidence in lead order."""
+        import time
+        
+        state = {
+            "leads": [
+                {
+                    "description": f"Event {i}",
+                    "type": "test",
+                    "search_query": f"test query {i}"
+                }
+                for i in range(8)
+            ]
+        }
+        
+        def slow_search(query, **kwargs):
+            # Earlier leads finish last
+            index = int(query.rsplit(" ", 1)[1])
+            time.sleep(0.01 * (8 - index))
+            return {"results": [{"title": query, "url": f"http://test.com/{index}", "content": "Test"}]}
+        
+        fact_checker_agent.tavily_client.search.side_effect = slow_search
+        
+        # Act
+        result = fact_checker_agent.process(state)
+        
+        # Assert evidence matches lead order
+        descriptions = [e["lead"]["description"] for e in result["evidence"]]
+        assert descriptions == [f"Event {i}" for i in range(8)]
+        assert result["evidence"][3]["results"][0]["title"] == "test query 3"
+    
+    @pytest.mark.unit
+    def test_fact_checker_shares_search_for_identical_queries(self, fact_checker_agent, mock_tavily_response):
+        """Test that leads with the same search query trigger a single search."""
+        state = {
+            "leads": [
+                {"description": "Climate March Morning Session", "type": "protest", "search_query": "Climate March NYC"},
+                {"description": "Climate March Evening Session", "type": "protest", "search_query": "Climate March NYC"},
+                {"description": "Different Event", "type": "cultural", "search_query": "Brooklyn Museum exhibition"}
+            ]
+        }
+        fact_checker_agent.tavily_client.search.return_value = mock_tavily_response
+        
+        # Act
+        result = fact_checker_agent.process(state)
+        
+        # Assert
+        assert fact_checker_agent.tavily_client.search.call_count == 2
+        descriptions = [e["lead"]["description"] for e in result["evidence"]]
+        assert descriptions == ["Climate March Morning Session", "Climate March Evening Session", "Different Event"]
+        assert result["evidence"][1]["results"] == result["evidence"][0]["results"]
+    
+    @pytest.mark.unit
+    def test_fact_checker_reuses_previous_cycle_evidence(self, fact_checker_agent, mock_tavily_response):
+        """Test that a retry cycle only searches queries not already covered by prior evidence."""
+        repeated = {"description": "Climate March", "type": "protest", "search_query": "Climate March NYC"}
+        state = {
+            "leads": [
+                dict(repeated),
+                {"description": "New Event", "type": "cultural", "search_query": "Brooklyn Museum exhibition"}
+            ],
+            "evidence": [
+                {"lead": repeated, "results": [{"title": "Prior", "url": "http://prior.com", "content": "Old"}]},
+                {"lead": {"description": "Failed", "search_query": "Brooklyn Museum exhibition"}, "results": [], "error": "timeout"}
+            ]
+        }
+        fact_checker_agent.tavily_client.search.return_value = mock_tavily_response
+        
+        # Act
+        result = fact_checker_agent.process(state)
+        
+        # Assert - only the new query is searched; the failed one is retried
+        fact_checker_agent.tavily_client.search.assert_called_once()
+        assert fact_checker_agent.tavily_client.search.call_args.kwargs["query"] == "Brooklyn Museum exhibition"
+        assert result["evidence"][0]["results"][0]["title"] == "Prior"
+        assert result["evidence"][1]["lead"]["description"] == "New Event"
@@ -2,13 +2,8 @@
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call
-import sys
-from pathlib import Path
 from datetime import datetime
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 from locaited.agents.publisher import PublisherAgent
 
 
@@ -411,4 +406,95 @@ class TestPublisherAgentExtractsEvents:
             # Assert
             assert result["gate_decision"] == "RETRY"
             assert len(result["events"]) == 0
-            assert "no evidence" in result["feedback"].lower()
\ No newline at end of file
+            assert "no evidence" in result["feedback"].lower()
+    
+    @pytest.mark.unit
+    def test_publisher_sends_each_source_url_once(self, publisher_agent):
+        """Test that sources shared across leads appear once in the extraction prompt."""
+        shared = {"url": "https://example.com/events", "title": "NYC Events", "content": "Weekly roundup"}
+        evidence = [
+            {
+                "lead": {"description": "Climate March"},
+                "results": [shared, {"url": "https://example.com/march", "title": "March", "content": "Details"}]
+            },
+            {
+                "lead": {"description": "Book Festival"},
+                "results": [shared, {"url": "https://example.com/books", "title": "Books", "content": "Details"}]
+            }
+        ]
+        
+        # Act
+        text = publisher_agent._format_evidence_for_llm(evidence)
+        
+        # Assert
+        assert text.count("https://example.com/events") == 1
+        assert "https://example.com/books" in text
+        assert "Source 1: https://example.com/books" in text
+    
+    @pytest.mark.unit
+    def test_publisher_dedup_ignores_url_variants(self, publisher_agent):
+        """Test that scheme, www. and tracking-parameter variants count as one source."""
+        evidence = [
+            {
+                "lead": {"description": "Climate March"},
+                "results": [{"url": "https://www.example.com/march/?utm_source=feed", "title": "March", "content": "A"}]
+            },
+            {
+                "lead": {"description": "Climate March Rally"},
+                "results": [
+                    {"url": "http://example.com/march", "title": "March", "content": "A"},
+                    {"url": "https://example.com/march?day=2", "title": "Day 2", "content": "B"}
+                ]
+            }
+        ]
+        
+        # Act
+        text = publisher_agent._format_evidence_for_llm(evidence)
+        
+        # Assert
+        assert "http://example.com/march\n" not in text
+        assert "https://example.com/march?day=2" in text
+
+    
+    @pytest.mark.unit
+    def test_publisher_reuses_extraction_for_same_evidence(self, publisher_agent, mock_extraction_response, tmp_path):
+        """Test that identical evidence is only sent to the extraction LLM once."""
+        evidence = [
+            {
+                "lead": {"description": "Climate March"},
+                "results": [{"url": "https://example.com/march", "title": "March", "content": "Details"}]
+            }
+        ]
+        publisher_agent.use_cache = True
+        publisher_agent.cache_dir = tmp_path
+        publisher_agent.cache_index_file = tmp_path / "index.json"
+        
+        with patch.object(publisher_agent, 'llm_client') as mock_llm:
+            mock_llm.complete_json.return_value = mock_extraction_response
+            
+            # Act
+            first = publisher_agent._process_evidence_with_llm(evidence)
+            second = publisher_agent._process_evidence_with_llm(evidence)
+            
+            # Assert
+            assert mock_llm.complete_json.call_count == 1
+            assert second == first
+    
+    @pytest.mark.unit
+    def test_publisher_reuses_gate_decision_for_same_events(self, publisher_agent, mock_gate_response_approve,
+                                                            sample_profile, sample_events, tmp_path):
+        """Test that the same events and interests are only judged by the LLM once."""
+        publisher_agent.use_cache = True
+        publisher_agent.cache_dir = tmp_path
+        publisher_agent.cache_index_file = tmp_path / "index.json"
+        
+        with patch.object(publisher_agent, 'llm_client') as mock_llm:
+            mock_llm.complete_json.return_value = mock_gate_response_approve
+            
+            # Act
+            first = publisher_agent._make_gate_decision(sample_events, sample_profile, [])
+            second = publisher_agent._make_gate_decision(sample_events, sample_profile, [])
+            
+            # Assert
+            assert mock_llm.complete_json.call_count == 1
+            assert second == first
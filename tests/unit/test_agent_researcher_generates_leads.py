@@ -2,13 +2,8 @@
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-import sys
-from pathlib import Path
 from datetime import datetime, timedelta
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 from locaited.agents.researcher import ResearcherAgent
 
 
@@ -412,4 +407,47 @@ class TestResearcherAgentGeneratesLeads:
                 
                 # Assert at least one expected term appears
                 assert any(term in prompt for term in expected_terms), \
-                    f"Expected one of {expected_terms} in prompt for '{time_frame}'"
\ No newline at end of file
+                    f"Expected one of {expected_terms} in prompt for '{time_frame}'"
+    
+    @pytest.mark.unit
+    def test_researcher_drops_near_duplicate_leads(self):
+        """Test that near-duplicate lead descriptions are removed before verification."""
+        from locaited.agents.researcher import _dedupe_leads
+        
+        leads = [
+            {"description": "Climate March at Washington Square Park on August 25"},
+            {"description": "Climate march at Washington Square Park, on August 25!"},
+            {"description": "Brooklyn Book Festival"},
+            {"description": "Climate March at Washington Square Park on August 26 evening rally"}
+        ]
+        
+        # Act
+        unique = _dedupe_leads(leads)
+        
+        # Assert first occurrence kept, distinct leads preserved
+        descriptions = [lead["description"] for lead in unique]
+        assert descriptions == [
+            "Climate March at Washington Square Park on August 25",
+            "Brooklyn Book Festival",
+            "Climate March at Washington Square Park on August 26 evening rally"
+        ]
+    
+    @pytest.mark.unit
+    def test_researcher_keeps_same_description_on_different_dates(self):
+        """Test that leads sharing a description but not a date, time or venue are all kept."""
+        from locaited.agents.researcher import _dedupe_leads
+        
+        description = "Union Square Greenmarket farmers market with local vendors"
+        leads = [
+            {"description": description, "date": "2025-08-25", "time": "8:00 AM", "venue": "Union Square"},
+            {"description": description, "date": "2025-08-27", "time": "8:00 AM", "venue": "Union Square"},
+            {"description": description, "date": "2025-08-25", "time": "2:00 PM", "venue": "Union Square"},
+            {"description": description, "date": "2025-08-25", "time": "8:00 AM", "venue": "Grand Army Plaza"},
+            {"description": description, "date": "2025-08-25", "time": "8:00 AM", "venue": "union square"}
+        ]
+        
+        # Act
+        unique = _dedupe_leads(leads)
+        
+        # Assert only the exact repeat of the first lead is dropped
+        assert unique == leads[:4]
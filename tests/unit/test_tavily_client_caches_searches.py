@@ -0,0 +1,127 @@
+"""Unit tests for Tavily client search coalescing, fallback and cache eviction."""
+
+import os
+import threading
+import time
+import pytest
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from locaited.utils.tavily_client import TavilyClient
+
+
+class TestTavilyClientCachesSearches:
+    """Test Tavily client caching behavior with the Tavily API stubbed out."""
+    
+    @pytest.fixture
+    def tavily_client(self, tmp_path, monkeypatch):
+        """Create a Tavily client with a stubbed API and a private cache directory."""
+        monkeypatch.setenv("TAVILY_API_KEY", "test-key")
+        client = TavilyClient(use_cache=True)
+        client.cache_dir = tmp_path
+        client.client = MagicMock()
+        yield client
+        client._cache_pool.shutdown(wait=True)
+    
+    @pytest.fixture
+    def mock_api_response(self):
+        """Mock raw Tavily API response."""
+        return {
+            "results": [
+                {
+                    "title": "Climate March Confirmed for August 25",
+                    "url": "https://example.com/climate-march",
+                    "content": "Activists gather at Washington Square Park...",
+                    "score": 0.95
+                }
+            ],
+            "answer": "A climate march is planned for August 25."
+        }
+    
+    @pytest.mark.unit
+    def test_tavily_coalesces_identical_inflight_searches(self, tavily_client, mock_api_response):
+        """Test that concurrent identical searches make one API call and get independent copies."""
+        # Arrange: the API call blocks until released; the waiter signals
+        # once it is waiting on the owner's in-flight future
+        tavily_client.use_cache = False
+        api_entered = threading.Event()
+        release_api = threading.Event()
+        waiter_joined = threading.Event()
+        
+        def slow_search(**params):
+            api_entered.set()
+            release_api.wait(timeout=5)
+            return mock_api_response
+        
+        class JoinTrackingFuture(Future):
+            def result(self, timeout=None):
+                waiter_joined.set()
+                return super().result(timeout)
+        
+        tavily_client.client.search.side_effect = slow_search
+        
+        # Act
+        with patch("locaited.utils.tavily_client.Future", JoinTrackingFuture):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                owner = executor.submit(tavily_client.search, "climate march NYC")
+                assert api_entered.wait(timeout=5)
+                waiter = executor.submit(tavily_client.search, "climate march NYC")
+                assert waiter_joined.wait(timeout=5)
+                release_api.set()
+                owner_results = owner.result(timeout=5)
+                waiter_results = waiter.result(timeout=5)
+        
+        # Assert one paid search, equal results, no shared objects
+        assert tavily_client.client.search.call_count == 1
+        assert tavily_client.total_searches == 1
+        assert waiter_results == owner_results
+        owner_results["results"].clear()
+        assert len(waiter_results["results"]) == 1
+        assert tavily_client._inflight == {}
+    
+    @pytest.mark.unit
+    def test_tavily_falls_back_when_domain_filter_finds_nothing(self, tavily_client, mock_api_response):
+        """Test that an empty include_domains search retries unrestricted and caches the fallback."""
+        # Arrange: filtered searches come back empty
+        def search(**params):
+            if params.get("include_domains"):
+                return {"results": [], "answer": None}
+            return mock_api_response
+        
+        tavily_client.client.search.side_effect = search
+        
+        # Act
+        results = tavily_client.search("climate march NYC", include_domains=["example.org"])
+        repeat = tavily_client.search("climate march NYC", include_domains=["example.org"])
+        
+        # Assert the unrestricted results are returned and cached under the filtered key
+        calls = tavily_client.client.search.call_args_list
+        assert len(calls) == 2
+        assert calls[0].kwargs["include_domains"] == ["example.org"]
+        assert "include_domains" not in calls[1].kwargs
+        assert len(results["results"]) == 1
+        assert repeat == results
+    
+    @pytest.mark.unit
+    def test_tavily_evicts_least_recently_used_cache_files(self, tavily_client):
+        """Test that eviction removes the oldest files by mtime and keeps recently read ones."""
+        # Arrange: 12 files with increasing ages, cap of 10
+        tavily_client.MAX_CACHE_ENTRIES = 10
+        now = time.time()
+        keys = [f"key{i:02d}" for i in range(12)]
+        for age, key in enumerate(reversed(keys)):
+            cache_file = tavily_client.cache_dir / f"{key}.json"
+            cache_file.write_bytes(f'{{"ts":{now},"results":{{"results":[]}}}}'.encode())
+            os.utime(cache_file, (now - 60 * (age + 1),) * 2)
+        
+        # A disk hit on the oldest file marks it recently used
+        assert tavily_client._get_from_cache("key00") is not None
+        
+        # Act
+        tavily_client._evict_cache_files()
+        
+        # Assert pruned to 90% of the cap, dropping the least recently used
+        remaining = sorted(path.stem for path in tavily_client.cache_dir.glob("*.json"))
+        assert len(remaining) == 9
+        assert "key00" in remaining
+        assert not {"key01", "key02", "key03"} & set(remaining)
@@ -0,0 +1,82 @@
+"""Unit tests for the workflow's single-pass fast path."""
+
+import pytest
+from unittest.mock import MagicMock
+
+from locaited.agents.workflow import Workflow
+
+
+class TestWorkflowRunsFastPath:
+    """Test that runs skip the graph unless the Publisher asks for a retry."""
+    
+    @pytest.fixture
+    def workflow(self):
+        """Create a workflow whose agents and compiled graph are mocked."""
+        workflow = Workflow(use_cache=False)
+        for name in ("editor", "researcher", "fact_checker", "publisher"):
+            agent = MagicMock()
+            agent.process.side_effect = lambda state: state
+            setattr(workflow, name, agent)
+        workflow.workflow = MagicMock()
+        return workflow
+    
+    @pytest.fixture
+    def user_input(self):
+        """Sample user input."""
+        return {"location": "NYC", "time_frame": "this week", "interests": ["protests"]}
+    
+    def _publish(self, decision, should_retry=True, events=None):
+        """Build a Publisher stub that records a gate decision."""
+        def process(state):
+            state["should_retry"] = should_retry
+            state["gate_decision"] = decision
+            state["events"] = events or []
+            return state
+        return process
+    
+    @pytest.mark.unit
+    def test_workflow_approves_without_invoking_graph(self, workflow, user_input):
+        """Test that an approved first pass never enters the LangGraph graph."""
+        # Arrange
+        workflow.publisher.process.side_effect = self._publish("APPROVE", events=[{"title": "Climate March"}])
+        
+        # Act
+        result = workflow.run_workflow(user_input)
+        
+        # Assert
+        workflow.workflow.invoke.assert_not_called()
+        for agent in (workflow.editor, workflow.researcher, workflow.fact_checker, workflow.publisher):
+            agent.process.assert_called_once()
+        assert result["gate_decision"] == "APPROVE"
+        assert result["events"] == [{"title": "Climate March"}]
+        assert result["workflow_metrics"]["final_decision"] == "APPROVE"
+    
+    @pytest.mark.unit
+    def test_workflow_retries_through_graph(self, workflow, user_input):
+        """Test that a RETRY on the first pass resumes in the graph with that pass's state."""
+        # Arrange
+        workflow.publisher.process.side_effect = self._publish("RETRY")
+        workflow.workflow.invoke.side_effect = lambda state: {**state, "gate_decision": "APPROVE"}
+        
+        # Act
+        result = workflow.run_workflow(user_input)
+        
+        # Assert
+        workflow.workflow.invoke.assert_called_once()
+        resumed_state = workflow.workflow.invoke.call_args.args[0]
+        assert resumed_state["user_input"] == user_input
+        assert resumed_state["gate_decision"] == "RETRY"
+        assert result["gate_decision"] == "APPROVE"
+    
+    @pytest.mark.unit
+    def test_workflow_stops_when_retries_exhausted(self, workflow, user_input):
+        """Test that a RETRY after the Editor's last iteration ends the run."""
+        # Arrange
+        workflow.publisher.process.side_effect = self._publish("RETRY", should_retry=False)
+        
+        # Act
+        result = workflow.run_workflow(user_input)
+        
+        # Assert
+        workflow.workflow.invoke.assert_not_called()
+        assert result["gate_decision"] == "RETRY"